@@ -461,6 +461,7 @@ def reset_database_globals():
     db_module._client = None
     db_module._collection = None
     db_module._persist_path = None
+    db_module.reset_client_cache()
 
     yield
 
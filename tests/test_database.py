@@ -22,6 +22,7 @@ from washedmcp.database import (
     get_function_context,
     _get_collection,
     _get_function_by_name,
+    reset_client_cache,
 )
 
 
@@ -75,6 +76,17 @@ class TestInitDb:
 
         assert collection1.name == collection2.name
 
+    def test_init_reuses_memoized_client(self, db_temp_dir, reset_database_globals):
+        """Repeat init for the same path should reuse the collection handle."""
+        db_path = os.path.join(db_temp_dir, "chroma")
+        collection1 = init_db(persist_path=db_path)
+        collection2 = init_db(persist_path=db_path)
+
+        assert collection1 is collection2
+
+        reset_client_cache()
+        assert init_db(persist_path=db_path) is not collection1
+
     def test_get_collection_auto_init(self, db_temp_dir, reset_database_globals):
         """_get_collection should auto-initialize if needed."""
         # Don't call init_db, just get_collection
@@ -147,6 +159,46 @@ class TestAddFunctions:
         stats = get_stats()
         assert stats["total_functions"] == 1
 
+    def test_add_with_embedding_matrix(self, fresh_db, sample_function_dict, mock_embedding):
+        """Should store rows of a float32 embedding matrix, skipping duplicate rows."""
+        import numpy as np
+
+        other = dict(sample_function_dict, name="other_func", line_start=20)
+        functions = [sample_function_dict, sample_function_dict, other]
+        matrix = np.asarray([mock_embedding] * 3, dtype=np.float32)
+
+        add_functions(functions, embeddings=matrix)
+
+        assert get_stats()["total_functions"] == 2
+
+    def test_add_rejects_bad_embedding_matrix(self, fresh_db, sample_function_dict):
+        """Should reject a matrix whose shape doesn't match the functions."""
+        import numpy as np
+        from washedmcp.security import EmbeddingValidationError
+
+        with pytest.raises(EmbeddingValidationError):
+            add_functions([sample_function_dict], embeddings=np.zeros((2, 384), dtype=np.float32))
+
+    def test_add_rejects_nan_embedding(self, fresh_db, sample_function_dict, mock_embedding):
+        """Should report the first NaN in a list embedding."""
+        from washedmcp.security import EmbeddingValidationError
+
+        bad = list(mock_embedding)
+        bad[7] = float("nan")
+        func = dict(sample_function_dict, embedding=bad)
+
+        with pytest.raises(EmbeddingValidationError, match="NaN at index 7"):
+            add_functions([func])
+
+    def test_add_accepts_ndarray_embeddings(self, fresh_db, sample_function_dict, mock_embedding):
+        """Should accept per-function numpy embeddings without list conversion."""
+        import numpy as np
+
+        func = dict(sample_function_dict, embedding=np.asarray(mock_embedding, dtype=np.float32))
+        add_functions([func])
+
+        assert get_stats()["total_functions"] == 1
+
     def test_add_handles_missing_optional_fields(self, fresh_db, mock_embedding):
         """Should handle functions without optional fields."""
         func = {
@@ -187,6 +239,24 @@ class TestSearch:
 
         assert len(results) <= 2
 
+    def test_search_accepts_ndarray_query(self, fresh_db, sample_function_dict):
+        """Should accept a numpy query embedding without list conversion."""
+        import numpy as np
+
+        add_functions([sample_function_dict])
+
+        results = search(np.full(384, 0.1, dtype=np.float32), top_k=1)
+
+        assert results[0]["function_name"] == "calculate_sum"
+
+    def test_search_rejects_wrong_shape_ndarray(self, fresh_db):
+        """Should reject a numpy query embedding with the wrong shape."""
+        import numpy as np
+        from washedmcp.security import EmbeddingValidationError
+
+        with pytest.raises(EmbeddingValidationError):
+            search(np.zeros(100, dtype=np.float32), top_k=1)
+
     def test_search_empty_db_returns_empty(self, fresh_db):
         """Should return empty list for empty database."""
         results = search([0.1] * 384, top_k=5)
@@ -240,6 +310,13 @@ class TestSearch:
         # func1 should be first (more similar)
         assert results[0]["function_name"] == "similar"
 
+    def test_stored_embeddings_are_normalized(self, fresh_db, sample_function_dict):
+        """Stored vectors should be unit length."""
+        add_functions([sample_function_dict])
+
+        stored = fresh_db.get(include=["embeddings"])["embeddings"][0]
+        assert sum(x * x for x in stored) == pytest.approx(1.0, abs=1e-5)
+
     def test_search_top_k_larger_than_db(self, fresh_db, sample_function_dict):
         """Should handle top_k larger than database size."""
         add_functions([sample_function_dict])
@@ -13,6 +13,7 @@ from washedmcp.embedder import (
     embed_code,
     embed_batch,
     embed_query,
+    embed_queries,
     EMBEDDING_DIMENSIONS,
     MODEL_NAME,
     _get_model,
@@ -146,6 +147,19 @@ class TestEmbedBatch:
 
             assert all(len(emb) == EMBEDDING_DIMENSIONS for emb in result)
 
+    def test_embed_batch_as_numpy_returns_matrix(self, mock_embedding):
+        """Should return the float32 matrix without converting to lists."""
+        with patch("washedmcp.embedder._get_model") as mock_get_model:
+            mock_model = MagicMock()
+            mock_model.encode.return_value = np.array([mock_embedding] * 2, dtype=np.float32)
+            mock_get_model.return_value = mock_model
+
+            result = embed_batch(["def a(): pass", "def b(): pass"], as_numpy=True)
+
+            assert isinstance(result, np.ndarray)
+            assert result.dtype == np.float32
+            assert result.shape == (2, EMBEDDING_DIMENSIONS)
+
 
 class TestEmbedQuery:
     """Tests for embed_query function."""
@@ -182,6 +196,28 @@ class TestEmbedQuery:
         assert call_args[0][0] == query
 
 
+class TestEmbedQueries:
+    """Tests for embed_queries function."""
+
+    def test_embed_queries_single_encode_call(self, mock_embedding):
+        """Should encode all queries in one model call."""
+        with patch("washedmcp.embedder._get_model") as mock_get_model:
+            mock_model = MagicMock()
+            mock_model.encode.return_value = np.array([mock_embedding] * 3)
+            mock_get_model.return_value = mock_model
+
+            result = embed_queries(["a", "b", "c"])
+
+            assert len(result) == 3
+            assert mock_model.encode.call_count == 1
+            assert mock_model.encode.call_args.kwargs["batch_size"] == 32
+
+    def test_embed_queries_empty_query_raises(self):
+        """Should raise ValueError if any query is empty."""
+        with pytest.raises(ValueError, match="cannot be empty"):
+            embed_queries(["find user", "  "])
+
+
 class TestModelLazyLoading:
     """Tests for lazy model initialization."""
 
@@ -9,6 +9,7 @@ import os
 import tempfile
 from unittest.mock import patch, MagicMock
 
+import numpy as np
 import pytest
 
 from washedmcp.indexer import (
@@ -92,8 +93,9 @@ function getConfig(): Config {
 @pytest.fixture
 def mock_embedder_for_indexer(mock_embedding):
     """Mock embedder for indexer tests."""
-    def embed_batch_mock(codes):
-        return [mock_embedding for _ in codes]
+    def embed_batch_mock(codes, as_numpy=False):
+        embeddings = [mock_embedding for _ in codes]
+        return np.asarray(embeddings, dtype=np.float32) if as_numpy else embeddings
 
     with patch("washedmcp.indexer.embed_batch", side_effect=embed_batch_mock):
         yield
@@ -12,6 +12,7 @@ import pytest
 
 from washedmcp.parser import (
     extract_functions,
+    extract_functions_from_bytes,
     extract_calls,
     get_supported_extensions,
     extract_imports,
@@ -546,6 +547,44 @@ function helper() {
         assert info["functions"] == []
 
 
+class TestExtractFunctionsFromBytes:
+    """Tests for extracting functions from an in-memory buffer."""
+
+    def test_matches_file_extraction(self, temp_dir):
+        """Should return the same entities as extract_functions."""
+        code = 'def hello():\n    return "world"\n'
+        file_path = os.path.join(temp_dir, "test.py")
+        with open(file_path, "w") as f:
+            f.write(code)
+
+        from_file = extract_functions(file_path)
+        from_bytes = extract_functions_from_bytes(code.encode("utf-8"), os.path.abspath(file_path))
+
+        assert from_bytes == from_file
+
+    def test_accepts_mmap(self, temp_dir):
+        """Should parse a read-only mmap without copying it first."""
+        import mmap
+
+        file_path = os.path.join(temp_dir, "test.py")
+        with open(file_path, "w") as f:
+            f.write("def mapped():\n    return helper()\n")
+
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                functions = extract_functions_from_bytes(buf, file_path)
+
+        assert len(functions) == 1
+        assert functions[0]["name"] == "mapped"
+        assert "helper" in functions[0]["calls"]
+
+    def test_respects_size_limit(self):
+        """Should skip buffers larger than the limit."""
+        source = b"def big(): pass\n" * 100
+
+        assert extract_functions_from_bytes(source, "/tmp/big.py", max_file_size_mb=0.0001) == []
+
+
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
 
@@ -5,6 +5,7 @@ Tests semantic code search functionality including
 search_code, is_indexed, and search_code_with_context.
 """
 
+import asyncio
 import os
 import tempfile
 from unittest.mock import patch, MagicMock
@@ -15,7 +16,15 @@ from washedmcp.searcher import (
     search_code,
     is_indexed,
     search_code_with_context,
+    get_query_embedding,
+    _clear_query_lru,
+    QUERY_CACHE_FILENAME,
+    _QueryCache,
+    embed_query_batched,
+    asearch_code,
+    asearch_code_with_context,
 )
+from washedmcp.security import InputValidationError
 
 
 @pytest.fixture
@@ -124,6 +133,68 @@ class TestSearchCode:
 
         assert isinstance(results, list)
 
+    def test_search_ranks_direct_name_hits_first(self, populated_db, mock_embed_query):
+        """Should put functions named verbatim in the query ahead of semantic matches."""
+        results = search_code("where is validate_email", persist_path=populated_db, top_k=3)
+
+        assert results[0]["function_name"] == "validate_email"
+        assert results[0]["exact_match"] is True
+        assert "similarity" not in results[0]
+        assert [r["function_name"] for r in results].count("validate_email") == 1
+
+    def test_exact_name_query_skips_embedding(self, populated_db):
+        """Should answer from name hits alone when they fill top_k."""
+        with patch("washedmcp.searcher.get_query_embedding") as mock_embed, \
+             patch("washedmcp.searcher.db_search") as mock_search:
+            results = search_code("validate_email()", persist_path=populated_db, top_k=1)
+
+        mock_embed.assert_not_called()
+        mock_search.assert_not_called()
+        assert [r["function_name"] for r in results] == ["validate_email"]
+        assert results[0]["exact_match"] is True
+
+    def test_search_merges_semantic_matches_with_name_hits(self, populated_db, mock_embedding):
+        """Should still embed the query and fill the rest of top_k semantically."""
+        with patch("washedmcp.searcher.get_query_embedding", return_value=mock_embedding) as mock_embed:
+            results = search_code(
+                "hash_password and create_user", persist_path=populated_db, top_k=3
+            )
+
+        mock_embed.assert_called_once()
+        assert [r["function_name"] for r in results[:2]] == ["hash_password", "create_user"]
+        assert results[2]["function_name"] == "validate_email"
+        assert "exact_match" not in results[2]
+
+    def test_search_ignores_plain_words_as_names(self, db_temp_dir, reset_database_globals, mock_embed_query):
+        """Should not treat ordinary words as function names."""
+        from washedmcp.database import init_db, add_functions
+
+        db_path = os.path.join(db_temp_dir, "chroma")
+        init_db(persist_path=db_path)
+        add_functions([
+            {
+                "name": name,
+                "code": f"def {name}(): pass",
+                "file_path": "/src/app.py",
+                "line_start": i,
+                "line_end": i,
+                "language": "python",
+                "summary": "",
+                "embedding": [0.1 * (i + 1)] * 384,
+                "calls": [],
+            }
+            for i, name in enumerate(["search", "parse", "main"])
+        ])
+
+        results = search_code("search and parse the main config", persist_path=db_path, top_k=3)
+
+        assert not any(r.get("exact_match") for r in results)
+
+        results = search_code("what calls main()", persist_path=db_path, top_k=3)
+
+        assert results[0]["function_name"] == "main"
+        assert results[0]["exact_match"] is True
+
     def test_search_derives_path_from_project_path(self, db_temp_dir, reset_database_globals, mock_embedding):
         """Should derive persist_path from project_path."""
         from washedmcp.database import init_db, add_functions
@@ -212,6 +283,14 @@ class TestIsIndexed:
 
         assert result is True
 
+    def test_is_indexed_cached_until_db_changes(self, populated_db):
+        """Should skip the count while the database files are unchanged."""
+        assert is_indexed(persist_path=populated_db) is True
+
+        with patch("washedmcp.searcher.get_stats") as mock_stats:
+            assert is_indexed(persist_path=populated_db) is True
+            mock_stats.assert_not_called()
+
     def test_is_indexed_handles_exceptions(self, db_temp_dir):
         """Should return False on exceptions."""
         # Path to a file instead of directory
@@ -326,3 +405,172 @@ class TestSearchEdgeCases:
 
         # Should return error format
         assert result == {"results": [], "context": None}
+
+
+class TestQueryEmbeddingCache:
+    """Tests for the in-process and on-disk query embedding cache."""
+
+    def test_repeated_query_embeds_once(self, db_temp_dir, mock_embedding):
+        """Should only run the model once for a repeated query."""
+        _clear_query_lru()
+
+        with patch("washedmcp.searcher.embed_query", return_value=mock_embedding) as mock_embed:
+            first = get_query_embedding("find palindrome", db_temp_dir)
+            second = get_query_embedding("find palindrome", db_temp_dir)
+
+        assert mock_embed.call_count == 1
+        assert first == second
+        assert len(first) == 384
+
+    def test_disk_cache_survives_memory_cache_clear(self, db_temp_dir, mock_embedding):
+        """Should serve a cached query from SQLite after the LRU is cleared."""
+        _clear_query_lru()
+
+        with patch("washedmcp.searcher.embed_query", return_value=mock_embedding) as mock_embed:
+            first = get_query_embedding("hash a password", db_temp_dir)
+            _clear_query_lru()
+            second = get_query_embedding("hash a password", db_temp_dir)
+
+        assert mock_embed.call_count == 1
+        assert first == second
+        assert os.path.exists(os.path.join(db_temp_dir, QUERY_CACHE_FILENAME))
+
+
+class TestSemanticQueryCache:
+    """Tests for the approximate (embedding-similarity) result cache."""
+
+    def test_near_duplicate_query_is_a_hit(self):
+        """Should serve results for a query close to a cached one."""
+        cache = _QueryCache(threshold=0.92)
+        cache.put([1.0, 0.0, 0.0], ("db", 5, 0), [{"function_name": "f"}])
+
+        assert cache.get([0.99, 0.05, 0.0], ("db", 5, 0)) == [{"function_name": "f"}]
+        assert cache.get([0.0, 1.0, 0.0], ("db", 5, 0)) is None
+
+    def test_scope_and_ttl_are_respected(self):
+        """Should miss for a different scope or an expired entry."""
+        cache = _QueryCache(ttl=-1.0)
+        cache.put([1.0, 0.0], ("db", 5, 0), ["cached"])
+
+        assert cache.get([1.0, 0.0], ("other", 5, 0)) is None
+        assert cache.get([1.0, 0.0], ("db", 5, 0)) is None
+
+    def test_evicts_least_recently_used(self):
+        """Should keep at most max_size entries, dropping the LRU one."""
+        cache = _QueryCache(max_size=2)
+        cache.put([1.0, 0.0, 0.0], "s", ["a"])
+        cache.put([0.0, 1.0, 0.0], "s", ["b"])
+        cache.get([1.0, 0.0, 0.0], "s")
+        cache.put([0.0, 0.0, 1.0], "s", ["c"])
+
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0, 0.0], "s") == ["a"]
+        assert cache.get([0.0, 1.0, 0.0], "s") is None
+
+
+class TestBatchedQueryEmbedding:
+    """Tests for coalescing concurrent query embeddings."""
+
+    def test_concurrent_queries_share_one_model_call(self, db_temp_dir, mock_embedding):
+        """Should embed queries awaited together with a single batch call."""
+        queries = ["find user", "parse config", "hash password"]
+
+        async def run():
+            return await asyncio.gather(
+                *(embed_query_batched(q, persist_path=db_temp_dir) for q in queries)
+            )
+
+        with patch(
+            "washedmcp.searcher.embed_queries",
+            side_effect=lambda qs, batch_size: [mock_embedding] * len(qs),
+        ) as mock_embed:
+            results = asyncio.run(run())
+
+        assert mock_embed.call_count == 1
+        assert sorted(mock_embed.call_args.args[0]) == sorted(queries)
+        assert all(len(vec) == 384 for vec in results)
+
+    def test_batched_query_served_from_memory_cache(self, db_temp_dir, mock_embedding):
+        """Should answer a query already in the in-process LRU without batching it."""
+        _clear_query_lru()
+        with patch("washedmcp.searcher.embed_query", return_value=mock_embedding):
+            expected = get_query_embedding("find user", db_temp_dir)
+
+        with patch("washedmcp.searcher.embed_queries") as mock_embed, \
+             patch("washedmcp.searcher._read_cached_embedding") as mock_disk:
+            result = asyncio.run(embed_query_batched("find user", persist_path=db_temp_dir))
+
+        mock_embed.assert_not_called()
+        mock_disk.assert_not_called()
+        assert result == expected
+
+
+class TestAsyncSearchCode:
+    """Tests for the async search entry point."""
+
+    def test_asearch_code_returns_search_results(self, db_temp_dir, mock_embedding):
+        """Should open the DB, embed, and return the database results."""
+        fake_results = [{"function_name": "validate_email", "similarity": 0.9}]
+
+        with patch("washedmcp.searcher.init_db") as mock_init, \
+             patch("washedmcp.searcher.db_search", return_value=fake_results) as mock_search, \
+             patch(
+                 "washedmcp.searcher.embed_queries",
+                 side_effect=lambda qs, batch_size: [mock_embedding] * len(qs),
+             ):
+            results = asyncio.run(
+                asearch_code("check email address", persist_path=db_temp_dir, top_k=3)
+            )
+
+        assert results == fake_results
+        mock_init.assert_called_once_with(persist_path=db_temp_dir)
+        assert mock_search.call_args.kwargs["top_k"] == 3
+
+    def test_asearch_code_exact_name_skips_embedding(self, populated_db):
+        """Should not embed or run the vector search for an exact-name query."""
+        with patch("washedmcp.searcher.embed_queries") as mock_embed, \
+             patch("washedmcp.searcher.db_search") as mock_search:
+            results = asyncio.run(
+                asearch_code("hash_password", persist_path=populated_db, top_k=1)
+            )
+
+        mock_embed.assert_not_called()
+        mock_search.assert_not_called()
+        assert [r["function_name"] for r in results] == ["hash_password"]
+
+    def test_asearch_code_invalid_query_raises(self):
+        """Should reject invalid queries before doing any work."""
+        with pytest.raises(InputValidationError):
+            asyncio.run(asearch_code(""))
+
+    def test_asearch_code_with_context_expands_top_matches(self, populated_db, mock_embedding):
+        """Should attach context to each of the top matches."""
+        with patch(
+            "washedmcp.searcher.embed_queries",
+            side_effect=lambda qs, batch_size: [mock_embedding] * len(qs),
+        ):
+            result = asyncio.run(
+                asearch_code_with_context("user auth", persist_path=populated_db, top_k=3, depth=1)
+            )
+
+        assert len(result["results"]) == 3
+        assert all("context" in r for r in result["results"])
+        assert result["context"] is result["results"][0]["context"]
+
+    def test_asearch_code_with_context_limits_expansion(self, populated_db, mock_embedding):
+        """Should only expand context for the requested number of top matches."""
+        with patch(
+            "washedmcp.searcher.embed_queries",
+            side_effect=lambda qs, batch_size: [mock_embedding] * len(qs),
+        ), patch(
+            "washedmcp.searcher.get_function_context", return_value={"callers": []}
+        ) as mock_context:
+            result = asyncio.run(
+                asearch_code_with_context(
+                    "user auth", persist_path=populated_db, top_k=3, depth=1, context_top_n=1
+                )
+            )
+
+        mock_context.assert_called_once()
+        assert "context" in result["results"][0]
+        assert all("context" not in r for r in result["results"][1:])
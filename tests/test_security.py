@@ -0,0 +1,235 @@
+"""
+Tests for the security module.
+
+Tests path validation against traversal and symlink escapes, both with
+and without the per-scan path caches, and embedding validation.
+"""
+
+import contextlib
+import os
+
+import numpy as np
+import pytest
+
+from washedmcp.security import (
+    validate_path,
+    is_safe_to_index,
+    path_cache_scope,
+    validate_embedding,
+    validate_embedding_matrix,
+    validate_embeddings_batch,
+    PathTraversalError,
+    EmbeddingValidationError,
+    _dir_chain_is_plain,
+    _cached_realpath,
+)
+
+
+@pytest.fixture
+def path_tree(temp_dir):
+    """
+    Build a base directory with plain files, symlinks and a sibling directory.
+
+    Layout (under a resolved temp dir):
+        base/pkg/mod.py
+        base/inner_link.py -> base/pkg/mod.py
+        base/link_dir -> outside/
+        base/link_file.py -> outside/secret.py
+        base2/other.py
+        outside/secret.py
+    """
+    root = os.path.realpath(temp_dir)
+    base = os.path.join(root, "base")
+    outside = os.path.join(root, "outside")
+    os.makedirs(os.path.join(base, "pkg"))
+    os.makedirs(outside)
+    os.makedirs(os.path.join(root, "base2"))
+
+    for path in (
+        os.path.join(base, "pkg", "mod.py"),
+        os.path.join(outside, "secret.py"),
+        os.path.join(root, "base2", "other.py"),
+    ):
+        with open(path, "w") as f:
+            f.write("def f():\n    pass\n")
+
+    os.symlink(os.path.join(base, "pkg", "mod.py"), os.path.join(base, "inner_link.py"))
+    os.symlink(outside, os.path.join(base, "link_dir"))
+    os.symlink(os.path.join(outside, "secret.py"), os.path.join(base, "link_file.py"))
+
+    return {"root": root, "base": base, "outside": outside}
+
+
+@pytest.fixture(params=["uncached", "scoped"])
+def cache_mode(request):
+    """Run a test both outside and inside path_cache_scope()."""
+    scope = path_cache_scope() if request.param == "scoped" else contextlib.nullcontext()
+    with scope:
+        yield request.param
+
+
+class TestValidatePath:
+    """Tests for validate_path."""
+
+    def test_plain_file_resolves(self, path_tree, cache_mode):
+        """Should return the real path of a file under the base."""
+        path = os.path.join(path_tree["base"], "pkg", "mod.py")
+
+        assert validate_path(path, path_tree["base"]) == path
+
+    def test_relative_path_resolves(self, path_tree, cache_mode):
+        """Should resolve relative paths against the base."""
+        expected = os.path.join(path_tree["base"], "pkg", "mod.py")
+
+        assert validate_path("pkg/mod.py", path_tree["base"]) == expected
+
+    def test_symlink_within_base_allowed(self, path_tree, cache_mode):
+        """Should allow a symlink whose target stays inside the base."""
+        path = os.path.join(path_tree["base"], "inner_link.py")
+
+        assert validate_path(path, path_tree["base"]) == os.path.join(
+            path_tree["base"], "pkg", "mod.py"
+        )
+
+    def test_symlinked_parent_directory_blocked(self, path_tree, cache_mode):
+        """Should reject a file reached through a symlinked directory."""
+        path = os.path.join(path_tree["base"], "link_dir", "secret.py")
+
+        with pytest.raises(PathTraversalError):
+            validate_path(path, path_tree["base"])
+
+    def test_symlinked_file_blocked(self, path_tree, cache_mode):
+        """Should reject a symlinked file pointing outside the base."""
+        path = os.path.join(path_tree["base"], "link_file.py")
+
+        with pytest.raises(PathTraversalError):
+            validate_path(path, path_tree["base"])
+
+    @pytest.mark.parametrize("path", ["../outside/secret.py", "pkg/../../outside/secret.py"])
+    def test_dotdot_escape_blocked(self, path_tree, cache_mode, path):
+        """Should reject '..' components that climb out of the base."""
+        with pytest.raises(PathTraversalError):
+            validate_path(path, path_tree["base"])
+
+    def test_sibling_prefix_blocked(self, path_tree, cache_mode):
+        """Should reject /base2/... for base /base despite the shared prefix."""
+        path = os.path.join(path_tree["root"], "base2", "other.py")
+
+        with pytest.raises(PathTraversalError):
+            validate_path(path, path_tree["base"])
+
+
+class TestPathCacheScope:
+    """Tests for path_cache_scope and stale symlink answers."""
+
+    def _replace_pkg_with_symlink(self, path_tree):
+        """Swap base/pkg for a symlink to a directory outside the base."""
+        pkg = os.path.join(path_tree["base"], "pkg")
+        os.remove(os.path.join(pkg, "mod.py"))
+        os.rmdir(pkg)
+        with open(os.path.join(path_tree["outside"], "mod.py"), "w") as f:
+            f.write("def g():\n    pass\n")
+        os.symlink(path_tree["outside"], pkg)
+
+    def test_directory_replaced_by_symlink_outside_scope(self, path_tree):
+        """Checks outside a scan should see a directory swapped for a symlink."""
+        path = os.path.join(path_tree["base"], "pkg", "mod.py")
+        validate_path(path, path_tree["base"])
+
+        self._replace_pkg_with_symlink(path_tree)
+
+        with pytest.raises(PathTraversalError):
+            validate_path(path, path_tree["base"])
+
+    def test_directory_replaced_by_symlink_between_scans(self, path_tree):
+        """A new scan should not reuse the previous scan's answers."""
+        path = os.path.join(path_tree["base"], "pkg", "mod.py")
+        with path_cache_scope():
+            validate_path(path, path_tree["base"])
+
+        self._replace_pkg_with_symlink(path_tree)
+
+        with path_cache_scope():
+            with pytest.raises(PathTraversalError):
+                validate_path(path, path_tree["base"])
+
+    def test_caches_cleared_on_exit(self, path_tree):
+        """Should drop memoized answers when the scope ends."""
+        path = os.path.join(path_tree["base"], "pkg", "mod.py")
+        with path_cache_scope():
+            validate_path(path, path_tree["base"])
+            assert _dir_chain_is_plain.cache_info().currsize > 0
+
+        assert _dir_chain_is_plain.cache_info().currsize == 0
+        assert _cached_realpath.cache_info().currsize == 0
+
+    def test_unscoped_checks_do_not_populate_caches(self, path_tree):
+        """Should not memoize anything outside a scope."""
+        with path_cache_scope():
+            pass
+
+        validate_path(os.path.join(path_tree["base"], "pkg", "mod.py"), path_tree["base"])
+
+        assert _dir_chain_is_plain.cache_info().currsize == 0
+
+
+class TestIsSafeToIndex:
+    """Tests for is_safe_to_index."""
+
+    def test_plain_file_is_safe(self, path_tree, cache_mode):
+        """Should accept a regular file under the base."""
+        path = os.path.join(path_tree["base"], "pkg", "mod.py")
+
+        assert is_safe_to_index(path, path_tree["base"]) == (True, None)
+
+    @pytest.mark.parametrize("relative", ["link_dir/secret.py", "link_file.py"])
+    def test_symlink_escapes_rejected(self, path_tree, cache_mode, relative):
+        """Should reject files reached through symlinks leaving the base."""
+        path = os.path.join(path_tree["base"], relative)
+
+        is_safe, reason = is_safe_to_index(path, path_tree["base"])
+
+        assert is_safe is False
+        assert reason
+
+
+class TestValidateEmbeddingMatrix:
+    """Tests for validate_embedding_matrix."""
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int64, np.bool_])
+    def test_numeric_matrix_is_valid(self, dtype):
+        """Should accept float, integer and bool matrices of the right shape."""
+        assert validate_embedding_matrix(np.ones((2, 4), dtype=dtype), expected_dim=4)
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.int64, np.bool_, object])
+    def test_agrees_with_single_vector_validator(self, dtype):
+        """A matrix should be valid exactly when each of its rows is."""
+        matrix = np.ones((2, 4), dtype=dtype)
+
+        def outcome(validate, value):
+            try:
+                return validate(value, expected_dim=4)
+            except EmbeddingValidationError:
+                return False
+
+        assert outcome(validate_embedding_matrix, matrix) == outcome(validate_embedding, matrix[0])
+
+    @pytest.mark.parametrize("matrix", [
+        np.array([[0.1, "x"], [0.2, 0.3]], dtype=object),
+        np.array([["a", "b"], ["c", "d"]]),
+    ])
+    def test_non_numeric_dtype_rejected(self, matrix):
+        """Should raise EmbeddingValidationError, not TypeError, for non-numeric arrays."""
+        with pytest.raises(EmbeddingValidationError, match="not numeric"):
+            validate_embedding_matrix(matrix, expected_dim=2)
+
+        with pytest.raises(EmbeddingValidationError):
+            validate_embeddings_batch(matrix, expected_dim=2)
+
+    def test_nan_rejected(self):
+        """Should report the row holding a NaN."""
+        matrix = np.ones((3, 4), dtype=np.float32)
+        matrix[1, 2] = np.nan
+
+        with pytest.raises(EmbeddingValidationError, match="index 1"):
+            validate_embedding_matrix(matrix, expected_dim=4)
@@ -0,0 +1,235 @@
+"""
+Tests for the stats module.
+
+Tests token savings tracking: thread-safe recording, batched and atomic
+persistence, reloading, resetting and tolerance of bad stats files.
+"""
+
+import gc
+import json
+import os
+import threading
+import weakref
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from washedmcp import stats as stats_module
+from washedmcp.stats import StatsTracker, TokenStats, STATS_FLUSH_EVERY
+
+
+@pytest.fixture
+def stats_path(temp_dir):
+    """Path for a stats file that does not exist yet."""
+    return Path(temp_dir) / "stats.json"
+
+
+@pytest.fixture
+def no_interval_flush():
+    """Only flush on the batch threshold, never on elapsed time."""
+    with patch.object(stats_module, "STATS_FLUSH_INTERVAL_SECONDS", float("inf")):
+        yield
+
+
+def _read(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+class TestRecordSearch:
+    """Tests for StatsTracker.record_search."""
+
+    def test_records_savings(self, stats_path):
+        """Should accumulate chars and estimated tokens saved."""
+        tracker = StatsTracker(stats_path)
+
+        tracker.record_search("x" * 100, "y" * 40)
+
+        s = tracker.get_stats()
+        assert s.total_searches == 1
+        assert s.total_chars_saved == 60
+        assert s.total_tokens_saved_est == 15
+        assert s.avg_savings_percent == 60.0
+        assert s.first_search_at == s.last_search_at
+
+    def test_get_stats_returns_snapshot(self, stats_path):
+        """Should return a copy that later searches do not change."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 100, "y" * 40)
+
+        snapshot = tracker.get_stats()
+        tracker.record_search("x" * 100, "y" * 40)
+
+        assert snapshot.total_searches == 1
+        assert tracker.get_stats().total_searches == 2
+
+    def test_get_stats_waits_for_recording(self, stats_path):
+        """Should not read the stats while another thread holds the lock."""
+        tracker = StatsTracker(stats_path)
+        result = []
+
+        with tracker._lock:
+            reader = threading.Thread(target=lambda: result.append(tracker.get_stats()))
+            reader.start()
+            reader.join(timeout=0.1)
+            assert reader.is_alive()
+
+        reader.join()
+        assert result[0].total_searches == 0
+
+    def test_concurrent_record_search(self, stats_path, no_interval_flush):
+        """Should not lose updates when searches are recorded from many threads."""
+        tracker = StatsTracker(stats_path)
+        threads_count, per_thread = 8, 200
+
+        def worker():
+            for _ in range(per_thread):
+                tracker.record_search("x" * 100, "y" * 40)
+
+        threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        total = threads_count * per_thread
+        s = tracker.get_stats()
+        assert s.total_searches == total
+        assert s.session_searches == total
+        assert s.total_chars_saved == 60 * total
+
+        tracker.flush()
+        assert _read(stats_path)["total_searches"] == total
+
+
+class TestPersistence:
+    """Tests for batched, atomic stats writes."""
+
+    def test_flushes_on_batch_threshold(self, stats_path, no_interval_flush):
+        """Should write only once STATS_FLUSH_EVERY searches are unsaved."""
+        tracker = StatsTracker(stats_path)
+
+        for _ in range(STATS_FLUSH_EVERY - 1):
+            tracker.record_search("x" * 10, "y" * 5)
+        assert not stats_path.exists()
+
+        tracker.record_search("x" * 10, "y" * 5)
+        assert _read(stats_path)["total_searches"] == STATS_FLUSH_EVERY
+
+    def test_write_leaves_no_temp_file(self, stats_path):
+        """Should replace stats.json atomically, leaving no temp file behind."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 10, "y" * 5)
+        tracker.flush()
+
+        assert os.listdir(stats_path.parent) == ["stats.json"]
+
+    def test_failed_write_removes_temp_file(self, stats_path):
+        """Should unlink the temp file when the rename fails."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 10, "y" * 5)
+
+        with patch.object(stats_module.os, "replace", side_effect=OSError("boom")):
+            tracker.flush()
+
+        assert os.listdir(stats_path.parent) == []
+
+    def test_trackers_sharing_a_file_do_not_collide(self, stats_path):
+        """Concurrent writers to one stats file should each use their own temp file."""
+        trackers = [StatsTracker(stats_path) for _ in range(4)]
+        errors = []
+
+        def worker(tracker):
+            for i in range(50):
+                tracker.record_search("x" * (10 + i), "y" * 5)
+                tracker.flush()
+
+        with patch.object(stats_module.logger, "warning", side_effect=errors.append):
+            threads = [threading.Thread(target=worker, args=(t,)) for t in trackers]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert errors == []
+        assert os.listdir(stats_path.parent) == ["stats.json"]
+        assert _read(stats_path)["total_searches"] == 50
+
+    def test_unchanged_stats_not_rewritten(self, stats_path):
+        """Should skip the write when the lifetime stats have not changed."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 10, "y" * 5)
+        tracker.flush()
+
+        with patch.object(stats_module.os, "replace") as mock_replace:
+            tracker._save_stats()
+
+        mock_replace.assert_not_called()
+
+    def test_reload_after_flush(self, stats_path):
+        """Should restore lifetime totals and reset session stats on reload."""
+        tracker = StatsTracker(stats_path)
+        for _ in range(3):
+            tracker.record_search("x" * 100, "y" * 40)
+        tracker.flush()
+
+        reloaded = StatsTracker(stats_path).get_stats()
+
+        assert reloaded.total_searches == 3
+        assert reloaded.total_chars_saved == 180
+        assert reloaded.first_search_at == tracker.get_stats().first_search_at
+        assert reloaded.session_searches == 0
+        assert reloaded.session_tokens_saved_est == 0
+
+    def test_reset(self, stats_path):
+        """Should zero all stats, on disk as well as in memory."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 100, "y" * 40)
+        tracker.flush()
+
+        tracker.reset()
+
+        assert tracker.get_stats() == TokenStats()
+        assert _read(stats_path)["total_searches"] == 0
+        assert tracker.get_summary() == "No searches recorded yet."
+
+
+class TestLoadStats:
+    """Tests for loading bad or foreign stats files."""
+
+    def test_corrupt_file_starts_fresh(self, stats_path):
+        """Should start from empty stats when the file is not valid JSON."""
+        stats_path.write_text("{not json")
+
+        assert StatsTracker(stats_path).get_stats() == TokenStats()
+
+    def test_unknown_keys_are_ignored(self, stats_path):
+        """Should keep known fields and ignore keys TokenStats does not have."""
+        stats_path.write_text(json.dumps({"total_searches": 7, "from_the_future": True}))
+
+        s = StatsTracker(stats_path).get_stats()
+
+        assert s.total_searches == 7
+        assert s.total_json_chars == 0
+
+
+class TestExitFlush:
+    """Tests for the module-level exit hook."""
+
+    def test_exit_hook_flushes_live_trackers(self, stats_path, no_interval_flush):
+        """Should write unsaved searches of live trackers at exit."""
+        tracker = StatsTracker(stats_path)
+        tracker.record_search("x" * 10, "y" * 5)
+        assert not stats_path.exists()
+
+        stats_module._flush_live_trackers()
+
+        assert _read(stats_path)["total_searches"] == 1
+
+    def test_trackers_are_not_kept_alive(self, stats_path):
+        """Registering for the exit flush should not keep a tracker alive."""
+        ref = weakref.ref(StatsTracker(stats_path))
+        gc.collect()
+
+        assert ref() is None
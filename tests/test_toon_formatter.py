@@ -12,8 +12,11 @@ import pytest
 from washedmcp.toon_formatter import (
     truncate,
     format_results_toon,
+    format_results_toon_soa,
     format_results_json,
+    format_results_json_bytes,
     format_results_rich,
+    format_results_rich_iter,
     format_results,
 )
 
@@ -159,6 +162,38 @@ class TestFormatResultsToon:
         assert "test" in output
         # Should not crash
 
+    def test_soa_matches_row_format(self):
+        """Column-oriented input should render exactly like the equivalent rows."""
+        results = [
+            {"function_name": "func1", "file_path": "/a.py", "line_start": 1,
+             "summary": "A very long summary that definitely exceeds the maximum column width",
+             "similarity": 0.9},
+            {"function_name": "func2", "file_path": "/b.py", "line_start": 5},
+        ]
+        columns_data = {
+            "function_name": ["func1", "func2"],
+            "file_path": ["/a.py", "/b.py"],
+            "line_start": [1, 5],
+            "summary": [results[0]["summary"], ""],
+            "similarity": [0.9, ""],
+        }
+
+        assert format_results_toon_soa(columns_data) == format_results_toon(results)
+
+    def test_soa_empty(self):
+        """Should handle empty column data."""
+        assert format_results_toon_soa({}) == format_results_toon([])
+
+    def test_soa_ragged_columns_rejected(self):
+        """Should refuse columns of different lengths instead of dropping rows."""
+        columns_data = {
+            "function_name": ["a", "b", "c"],
+            "file_path": ["/a.py", "/b.py"],
+        }
+
+        with pytest.raises(ValueError, match="lengths differ"):
+            format_results_toon_soa(columns_data)
+
 
 class TestFormatResultsJson:
     """Tests for JSON format output."""
@@ -216,6 +251,33 @@ class TestFormatResultsJson:
 
         assert len(parsed) == 2
 
+    def test_non_ascii_matches_json_dumps(self):
+        """Should escape non-ASCII text exactly like json.dumps, whatever the backend."""
+        results = [{
+            "function_name": "größe",
+            "file_path": "/src/日本.py",
+            "line_start": 1,
+            "summary": "returns 🎉 on success",
+            "similarity": 0.9,
+        }]
+
+        output = format_results_json(results)
+
+        assert output == json.dumps(results, indent=2)
+        assert json.loads(output) == results
+
+    def test_bytes_variant_matches_str(self):
+        """format_results_json_bytes should be the encoding of format_results_json."""
+        results = [
+            {"function_name": "größe", "file_path": "/a.py", "line_start": 1, "summary": "🎉", "similarity": 0.9},
+        ]
+
+        output = format_results_json_bytes(results)
+
+        assert isinstance(output, bytes)
+        assert output == json.dumps(results, indent=2).encode("ascii")
+        assert output.decode("ascii") == format_results_json(results)
+
 
 class TestFormatResultsRich:
     """Tests for rich format output with context."""
@@ -243,6 +305,19 @@ class TestFormatResultsRich:
         assert "/auth.py:42" in output
         assert "92%" in output
 
+    def test_exact_name_match_without_similarity(self):
+        """Should label name hits as exact rather than as a 0% match."""
+        results = [
+            {"function_name": "validate", "file_path": "/auth.py", "line_start": 42, "exact_match": True},
+            {"function_name": "check", "file_path": "/auth.py", "line_start": 7, "exact_match": True},
+        ]
+
+        output = format_results_rich(results)
+
+        assert "/auth.py:42 (exact name match)" in output
+        assert "/auth.py:7 (exact)" in output
+        assert "0%" not in output
+
     def test_shows_code(self):
         """Should show the code."""
         results = [{
@@ -376,6 +451,23 @@ class TestFormatResultsRich:
         assert "CALLED BY:" not in output
 
 
+class TestFormatResultsRichIter:
+    """Tests for the line-by-line rich formatter."""
+
+    def test_lines_join_to_rich_output(self):
+        """Joined lines should equal format_results_rich output."""
+        results = [
+            {"function_name": "a", "file_path": "/a.py", "line_start": 1, "similarity": 0.9, "code": "def a(): pass"},
+            {"function_name": "b", "file_path": "/b.py", "line_start": 2, "similarity": 0.8},
+        ]
+        context = {"callees": [{"function_name": "c"}], "callers": [], "same_file": []}
+
+        lines = list(format_results_rich_iter(results, context))
+
+        assert "\n".join(lines) == format_results_rich(results, context)
+        assert all("\n" not in line for line in lines)
+
+
 class TestFormatResults:
     """Tests for the unified format_results function."""
 
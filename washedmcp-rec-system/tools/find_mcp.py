@@ -3,17 +3,25 @@ import csv
 from typing import Optional
 from pydantic import BaseModel
 
-import google.generativeai as genai
-
 # Configure Gemini API from environment variable
 api_key = os.getenv("GEMINI_API_KEY", "")
-if api_key:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash')
-else:
-    model = None
+if not api_key:
     print("Warning: GEMINI_API_KEY not set. Recommendations will return all MCPs.")
 
+# Created on first recommendation; google.generativeai is slow to import
+_model = None
+
+
+def _get_model():
+    """Return the Gemini model, importing and configuring the SDK on first use."""
+    global _model
+    if _model is None and api_key:
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        _model = genai.GenerativeModel('gemini-2.0-flash')
+    return _model
+
 
 class MCPInfo(BaseModel):
     """MCP Server Information"""
@@ -66,6 +74,7 @@ def recommend_mcps_with_gemini(user_context: str, csv_path: str = None) -> list[
     Returns:
         List of MCPInfo objects recommended by Gemini
     """
+    model = _get_model()
     if model is None:
         # No API key, return all MCPs
         return load_mcp_database(csv_path)
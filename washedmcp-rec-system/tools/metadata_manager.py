@@ -1,4 +1,5 @@
 """Metadata Manager for MCP installation database."""
+import difflib
 import json
 from pathlib import Path
 from typing import Optional, Dict, List, Any
@@ -34,6 +35,14 @@ class MetadataManager:
             with open(self.metadata_path, 'r', encoding='utf-8') as f:
                 self.metadata = json.load(f)
 
+        self._index_names()
+
+    def _index_names(self):
+        """Cache lowercased display names, so lookups don't re-lower every row."""
+        self._lower_names = [
+            (mcp["name"].lower(), mcp) for mcp in self.metadata["mcps"].values()
+        ]
+
     def get_mcp(self, name: str) -> Optional[Dict]:
         """
         Get MCP metadata by name (case-insensitive).
@@ -101,6 +110,32 @@ class MetadataManager:
 
         return results
 
+    def suggest(self, query: str, k: int = 3) -> List[Dict]:
+        """
+        Suggest MCPs for a name that didn't match exactly ("Did you mean").
+
+        Names containing the query come first, then close fuzzy matches.
+
+        Args:
+            query: The name the user asked for
+            k: Maximum number of suggestions
+
+        Returns:
+            Up to k MCP metadata dicts
+        """
+        query_lower = query.lower()
+
+        suggestions = [mcp for name, mcp in self._lower_names if query_lower in name][:k]
+        if len(suggestions) < k:
+            by_name = dict(self._lower_names)
+            for name in difflib.get_close_matches(query_lower, list(by_name), n=k):
+                if by_name[name] not in suggestions:
+                    suggestions.append(by_name[name])
+                if len(suggestions) == k:
+                    break
+
+        return suggestions
+
     def add_mcp(self, mcp_id: str, mcp_data: Dict):
         """
         Add new MCP to metadata database.
@@ -111,6 +146,7 @@ class MetadataManager:
         """
         self.metadata["mcps"][mcp_id] = mcp_data
         self.metadata["last_updated"] = datetime.now().isoformat()
+        self._index_names()
         self._save_metadata()
 
     def update_mcp(self, mcp_id: str, mcp_data: Dict):
@@ -124,6 +160,7 @@ class MetadataManager:
         if mcp_id in self.metadata["mcps"]:
             self.metadata["mcps"][mcp_id].update(mcp_data)
             self.metadata["last_updated"] = datetime.now().isoformat()
+            self._index_names()
             self._save_metadata()
 
     def delete_mcp(self, mcp_id: str) -> bool:
@@ -139,6 +176,7 @@ class MetadataManager:
         if mcp_id in self.metadata["mcps"]:
             del self.metadata["mcps"][mcp_id]
             self.metadata["last_updated"] = datetime.now().isoformat()
+            self._index_names()
             self._save_metadata()
             return True
         return False
@@ -20,11 +20,23 @@ from .config import (
 
 # Core modules
 from .parser import extract_functions, get_supported_extensions
-from .embedder import embed_code, embed_batch, embed_query, get_embedding_dimensions
+from .embedder import embed_code, embed_batch, embed_query, embed_queries, get_embedding_dimensions
 from .database import init_db, add_functions, search, get_stats, compute_called_by
 from .indexer import index_codebase
-from .searcher import search_code, search_code_with_context, is_indexed
-from .toon_formatter import format_results_rich
+from .searcher import (
+    search_code,
+    search_code_with_context,
+    asearch_code,
+    asearch_code_with_context,
+    is_indexed,
+    embed_query_batched,
+)
+from .toon_formatter import (
+    format_results_json_bytes,
+    format_results_rich,
+    format_results_rich_iter,
+    format_results_toon_soa,
+)
 
 # Security module
 from .security import (
@@ -38,9 +50,13 @@ from .security import (
     sanitize_path,
     validate_file_size,
     is_safe_to_index,
+    is_safe_to_index_entry,
+    clear_path_caches,
+    path_cache_scope,
     validate_query,
     validate_embedding,
     validate_embeddings_batch,
+    validate_embedding_matrix,
     validate_persist_path,
     sanitize_for_prompt,
     MAX_FILE_SIZE_MB,
@@ -65,6 +81,7 @@ from .background import (
     get_index_job_status,
     cancel_index_job,
     get_active_indexing,
+    wait_index_status_change,
 )
 
 # Stats module
@@ -100,6 +117,7 @@ __all__ = [
     "embed_code",
     "embed_batch",
     "embed_query",
+    "embed_queries",
     "get_embedding_dimensions",
     "init_db",
     "add_functions",
@@ -109,8 +127,14 @@ __all__ = [
     "index_codebase",
     "search_code",
     "search_code_with_context",
+    "asearch_code",
+    "asearch_code_with_context",
     "is_indexed",
+    "embed_query_batched",
+    "format_results_json_bytes",
     "format_results_rich",
+    "format_results_rich_iter",
+    "format_results_toon_soa",
     # Security API
     "SecurityError",
     "PathTraversalError",
@@ -122,9 +146,13 @@ __all__ = [
     "sanitize_path",
     "validate_file_size",
     "is_safe_to_index",
+    "is_safe_to_index_entry",
+    "clear_path_caches",
+    "path_cache_scope",
     "validate_query",
     "validate_embedding",
     "validate_embeddings_batch",
+    "validate_embedding_matrix",
     "validate_persist_path",
     "sanitize_for_prompt",
     "MAX_FILE_SIZE_MB",
@@ -145,6 +173,7 @@ __all__ = [
     "get_index_job_status",
     "cancel_index_job",
     "get_active_indexing",
+    "wait_index_status_change",
     # Stats API
     "TokenStats",
     "StatsTracker",
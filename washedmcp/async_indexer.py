@@ -6,6 +6,7 @@ during long-running indexing operations.
 """
 
 import asyncio
+import functools
 import os
 from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
@@ -18,6 +19,7 @@ from .security import (
     sanitize_path,
     validate_persist_path,
     is_safe_to_index,
+    path_cache_scope,
     SecurityError,
     MAX_FILE_SIZE_MB,
 )
@@ -109,29 +111,31 @@ async def _scan_files_async(
     def _scan_sync():
         """Synchronous scanning in thread."""
         result = []
-        for root, dirs, files in os.walk(path, followlinks=False):
-            # Check for cancellation
-            if asyncio.current_task() and asyncio.current_task().cancelled():
-                raise asyncio.CancelledError()
-
-            # Skip directories we don't want to index
-            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-
-            # Also skip symlinked directories to prevent loops
-            dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
-
-            for filename in files:
-                _, ext = os.path.splitext(filename)
-                if ext in supported_extensions:
-                    filepath = os.path.join(root, filename)
-
-                    # Security check: validate file is safe to index
-                    is_safe, reason = is_safe_to_index(filepath, path, max_file_size_mb)
-                    if not is_safe:
-                        logger.debug("Skipping file (security): %s - %s", filepath, reason)
-                        continue
-
-                    result.append(filepath)
+        # Memoize symlink checks for this scan only
+        with path_cache_scope():
+            for root, dirs, files in os.walk(path, followlinks=False):
+                # Check for cancellation
+                if asyncio.current_task() and asyncio.current_task().cancelled():
+                    raise asyncio.CancelledError()
+
+                # Skip directories we don't want to index
+                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+
+                # Also skip symlinked directories to prevent loops
+                dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+                for filename in files:
+                    _, ext = os.path.splitext(filename)
+                    if ext in supported_extensions:
+                        filepath = os.path.join(root, filename)
+
+                        # Security check: validate file is safe to index
+                        is_safe, reason = is_safe_to_index(filepath, path, max_file_size_mb)
+                        if not is_safe:
+                            logger.debug("Skipping file (security): %s - %s", filepath, reason)
+                            continue
+
+                        result.append(filepath)
         return result
 
     # Run scanning in thread pool to avoid blocking
@@ -247,8 +251,10 @@ async def _embed_functions_async(
         if progress_callback:
             progress_callback(progress)
 
-        # Run embedding in thread pool
-        embeddings = await loop.run_in_executor(None, embed_batch, codes)
+        # Run embedding in thread pool, keeping the float32 matrix
+        embeddings = await loop.run_in_executor(
+            None, functools.partial(embed_batch, codes, as_numpy=True)
+        )
 
         # Assign embeddings to functions
         for func, embedding in zip(batch, embeddings):
@@ -315,7 +321,7 @@ async def _compute_relations_async(
         progress: Progress object to update
         progress_callback: Optional callback for progress updates
     """
-    from .database import compute_called_by
+    from .database import compute_called_by, reset_client_cache
 
     progress.phase = IndexPhase.COMPUTING_RELATIONS.value
     progress.progress = 0.9  # Relations is ~10% of work
@@ -327,6 +333,9 @@ async def _compute_relations_async(
     loop = asyncio.get_event_loop()
     await loop.run_in_executor(None, compute_called_by)
 
+    # Searches reopen the rebuilt database rather than reuse pre-index handles
+    reset_client_cache()
+
     progress.progress = 1.0
 
 
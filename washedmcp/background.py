@@ -110,6 +110,39 @@ class BackgroundJobManager:
         self._lock = asyncio.Lock()
         self._worker_task: Optional[asyncio.Task] = None
         self._started = False
+        # Set (and replaced) whenever job status changes; long-poll waiters
+        # hold the old event, so a replace never loses a wake-up
+        self._status_changed = asyncio.Event()
+        self._notified_progress: Dict[str, float] = {}
+
+    def _notify_status_change(self, job: JobInfo, force: bool = False):
+        """
+        Wake status waiters if the job moved by at least 1% (or force is set).
+
+        Must be called from the event loop thread.
+        """
+        last = self._notified_progress.get(job.job_id)
+        if not force and last is not None and job.progress - last < 0.01:
+            return
+        self._notified_progress[job.job_id] = job.progress
+        self._status_changed.set()
+        self._status_changed = asyncio.Event()
+
+    async def wait_for_status_change(self, timeout: float) -> bool:
+        """
+        Wait until any job's status changes.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a change was signalled, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._status_changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def _ensure_started(self):
         """Ensure the job manager is started."""
@@ -151,6 +184,7 @@ class BackgroundJobManager:
 
         job.status = JobStatus.RUNNING
         job.started_at = time.time()
+        self._notify_status_change(job, force=True)
         logger.debug("Starting job %s (type: %s)", job.job_id, job.job_type)
 
         try:
@@ -169,6 +203,8 @@ class BackgroundJobManager:
             job.error = str(e)
         finally:
             job.completed_at = time.time()
+            self._notify_status_change(job, force=True)
+            self._notified_progress.pop(job.job_id, None)
             logger.info("Job %s completed with status: %s", job.job_id, job.status.value)
             async with self._lock:
                 self._running_count -= 1
@@ -190,6 +226,8 @@ class BackgroundJobManager:
             if job._cancelled:
                 raise asyncio.CancelledError()
 
+            phase_changed = job.phase != progress.phase
+
             job.progress = progress.progress
             job.phase = progress.phase
             job.files_processed = progress.files_processed
@@ -197,6 +235,8 @@ class BackgroundJobManager:
             job.functions_found = progress.functions_found
             job.current_file = progress.current_file
 
+            self._notify_status_change(job, force=phase_changed)
+
         # Create task for cancellation support
         task = asyncio.current_task()
         job._task = task
@@ -312,6 +352,7 @@ class BackgroundJobManager:
         job.status = JobStatus.CANCELLED
         job.error = "Job was cancelled"
         job.completed_at = time.time()
+        self._notify_status_change(job, force=True)
 
         return True
 
@@ -454,6 +495,20 @@ async def get_active_indexing() -> Optional[Dict[str, Any]]:
     return await manager.get_active_index_job()
 
 
+async def wait_index_status_change(timeout: float) -> bool:
+    """
+    Block until indexing status changes (>=1% progress, phase or state).
+
+    Args:
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if a change was signalled, False on timeout
+    """
+    manager = get_job_manager()
+    return await manager.wait_for_status_change(timeout)
+
+
 if __name__ == "__main__":
     import sys
     import os
@@ -118,7 +118,8 @@ class DatabaseConfig:
     # Collection name
     collection_name: str = "codebase"
 
-    # Distance metric for similarity search
+    # Distance metric for similarity search. Applies when a collection is
+    # created; existing collections keep their metric until reindexed
     distance_metric: str = "cosine"  # Options: cosine, l2, ip
 
     # Batch size for upsert operations
@@ -4,6 +4,7 @@ Chroma vector database module for storing and searching code embeddings.
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import os
@@ -11,6 +12,7 @@ from collections import defaultdict
 from typing import Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from .config import get_config
@@ -18,6 +20,7 @@ from .logging_config import get_logger
 from .security import (
     validate_embedding,
     validate_embeddings_batch,
+    validate_embedding_matrix,
     EmbeddingValidationError,
     EXPECTED_EMBEDDING_DIM,
 )
@@ -30,6 +33,57 @@ _collection = None
 _persist_path = None
 
 
+@functools.lru_cache(maxsize=8)
+def _get_client(
+    persist_path: str,
+    collection_name: str,
+    distance_metric: str,
+    anonymized_telemetry: bool,
+) -> tuple:
+    """
+    Open a Chroma client and collection once per persist path.
+
+    Creating the client and looking up the collection reads SQLite metadata,
+    so the pair is memoized; call reset_client_cache() after a rebuild.
+    """
+    client = chromadb.PersistentClient(
+        path=persist_path,
+        settings=Settings(anonymized_telemetry=anonymized_telemetry)
+    )
+    collection = client.get_or_create_collection(
+        name=collection_name,
+        metadata={"hnsw:space": distance_metric}
+    )
+    # get_or_create_collection keeps an existing collection's metric
+    stored_metric = (collection.metadata or {}).get("hnsw:space", distance_metric)
+    if stored_metric != distance_metric:
+        logger.warning(
+            "Collection '%s' uses distance metric '%s', not the configured '%s'; "
+            "reindex to switch",
+            collection_name, stored_metric, distance_metric,
+        )
+    return client, collection
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale rows (or a single vector) to unit L2 norm.
+
+    With unit vectors inner product equals cosine similarity, so scores
+    agree whichever space a collection was created with. Zero vectors are
+    left as-is.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return vectors / norms
+
+
+def reset_client_cache() -> None:
+    """Drop memoized clients so the next init_db reopens the database."""
+    _get_client.cache_clear()
+
+
 def init_db(persist_path: str = None) -> chromadb.Collection:
     """
     Initialize Chroma with persistence and return or create collection named 'codebase'.
@@ -47,22 +101,19 @@ def init_db(persist_path: str = None) -> chromadb.Collection:
 
     logger.debug("Initializing database at %s", persist_path)
 
-    # Create directory if it doesn't exist
-    os.makedirs(persist_path, exist_ok=True)
-
-    _persist_path = persist_path
-    _client = chromadb.PersistentClient(
-        path=persist_path,
-        settings=Settings(anonymized_telemetry=config.database.anonymized_telemetry)
-    )
-
-    # Map config distance metric to ChromaDB space
-    distance_space = config.database.distance_metric
-
-    _collection = _client.get_or_create_collection(
-        name=config.database.collection_name,
-        metadata={"hnsw:space": distance_space}
+    # Create directory if it doesn't exist; a missing directory also means
+    # any memoized client for this path is stale
+    if not os.path.isdir(persist_path):
+        os.makedirs(persist_path, exist_ok=True)
+        reset_client_cache()
+
+    _client, _collection = _get_client(
+        persist_path,
+        config.database.collection_name,
+        config.database.distance_metric,
+        config.database.anonymized_telemetry,
     )
+    _persist_path = persist_path
 
     logger.debug("Database initialized with collection '%s'", config.database.collection_name)
     return _collection
@@ -76,11 +127,18 @@ def _get_collection() -> chromadb.Collection:
     return _collection
 
 
-def add_functions(functions: list[dict]) -> None:
+def add_functions(functions: list[dict], embeddings: Optional[np.ndarray] = None) -> None:
     """
     Add functions to the collection.
     Each function dict should have: name, code, file_path, line_start, line_end, language, summary, embedding
 
+    Args:
+        functions: Function dicts to store.
+        embeddings: Optional float32 array of shape (len(functions), dim). When given,
+                    row i is stored as the embedding of functions[i] and the per-function
+                    "embedding" key is ignored, so callers holding one contiguous matrix
+                    never materialize per-function float lists.
+
     Raises:
         EmbeddingValidationError: If any embedding has invalid dimensions or format.
     """
@@ -93,21 +151,25 @@ def add_functions(functions: list[dict]) -> None:
     logger.debug("Adding %d functions to collection", len(functions))
 
     # Validate all embeddings before proceeding
-    embeddings_to_validate = [f.get("embedding") for f in functions if f.get("embedding") is not None]
-    if embeddings_to_validate:
-        try:
-            validate_embeddings_batch(embeddings_to_validate, EXPECTED_EMBEDDING_DIM)
-        except EmbeddingValidationError as e:
-            logger.error("Embedding validation failed: %s", e)
-            raise
+    try:
+        if embeddings is not None:
+            validate_embedding_matrix(embeddings, len(functions), EXPECTED_EMBEDDING_DIM)
+        else:
+            embeddings_to_validate = [f.get("embedding") for f in functions if f.get("embedding") is not None]
+            if embeddings_to_validate:
+                validate_embeddings_batch(embeddings_to_validate, EXPECTED_EMBEDDING_DIM)
+    except EmbeddingValidationError as e:
+        logger.error("Embedding validation failed: %s", e)
+        raise
 
     ids = []
     documents = []
     metadatas = []
-    embeddings = []
+    embedding_lists = []
+    kept_rows = []
     seen_ids = set()
 
-    for func in functions:
+    for row, func in enumerate(functions):
         # Create unique ID from file_path + name + line_start
         id_string = f"{func['file_path']}:{func['name']}:{func['line_start']}"
         func_id = hashlib.sha256(id_string.encode()).hexdigest()[:32]
@@ -119,7 +181,10 @@ def add_functions(functions: list[dict]) -> None:
 
         ids.append(func_id)
         documents.append(func["code"])
-        embeddings.append(func["embedding"])
+        if embeddings is None:
+            embedding_lists.append(func["embedding"])
+        else:
+            kept_rows.append(row)
         # Handle new metadata fields with backward compatibility
         # Store lists as JSON strings since Chroma metadata only supports primitives
         calls = func.get("calls", [])
@@ -139,6 +204,15 @@ def add_functions(functions: list[dict]) -> None:
             "called_by": "[]"  # Will be computed later via compute_called_by()
         })
 
+    if embeddings is None:
+        embeddings = np.asarray(embedding_lists, dtype=np.float32)
+    elif len(kept_rows) != len(functions):
+        # Drop rows of skipped duplicates
+        embeddings = embeddings[kept_rows]
+
+    # Store unit vectors so inner product equals cosine similarity
+    embeddings = _l2_normalize(embeddings)
+
     # Upsert in batches using config batch size
     config = get_config()
     batch_size = config.database.upsert_batch_size
@@ -147,15 +221,25 @@ def add_functions(functions: list[dict]) -> None:
         collection.upsert(
             ids=ids[i:batch_end],
             documents=documents[i:batch_end],
-            embeddings=embeddings[i:batch_end],
+            # chromadb 0.4 only accepts list embeddings; convert one batch at a time
+            embeddings=embeddings[i:batch_end].tolist(),
             metadatas=metadatas[i:batch_end]
         )
 
 
-def search(query_embedding: list[float], top_k: int = 5) -> list[dict]:
+def search(
+    query_embedding: list[float],
+    top_k: int = 5,
+    collection: Optional[chromadb.Collection] = None,
+) -> list[dict]:
     """
     Search for similar code using the query embedding.
 
+    Args:
+        query_embedding: The embedded query (a list or 1-D numpy array).
+        top_k: Maximum number of results.
+        collection: Collection to search (the current one if None).
+
     Raises:
         EmbeddingValidationError: If query embedding has invalid dimensions or format.
     """
@@ -166,15 +250,20 @@ def search(query_embedding: list[float], top_k: int = 5) -> list[dict]:
         logger.error("Query embedding validation failed: %s", e)
         raise
 
-    collection = _get_collection()
+    if collection is None:
+        collection = _get_collection()
 
-    if collection.count() == 0:
+    count = collection.count()
+    if count == 0:
         logger.debug("Search called on empty collection")
         return []
 
-    actual_top_k = min(top_k, collection.count())
+    actual_top_k = min(top_k, count)
     logger.debug("Searching for top %d results", actual_top_k)
 
+    # Stored vectors are unit length; normalize the query to match
+    query_embedding = _l2_normalize(query_embedding).tolist()
+
     results = collection.query(
         query_embeddings=[query_embedding],
         n_results=actual_top_k,
@@ -184,13 +273,15 @@ def search(query_embedding: list[float], top_k: int = 5) -> list[dict]:
     output = []
 
     if results["ids"] and results["ids"][0]:
+        # Convert distances to similarities in one pass (0 = identical, 2 = opposite);
+        # for unit vectors the cosine and ip spaces give the same distance
+        distances = np.asarray(results["distances"][0], dtype=np.float64)
+        similarities = np.round(1.0 - distances / 2.0, 4).tolist()
+
         for i, doc_id in enumerate(results["ids"][0]):
             metadata = results["metadatas"][0][i]
             document = results["documents"][0][i]
-            distance = results["distances"][0][i]
-
-            # Convert cosine distance to similarity (0 = identical, 2 = opposite)
-            similarity = 1 - (distance / 2)
+            similarity = similarities[i]
 
             # Parse JSON fields with backward compatibility
             calls = json.loads(metadata.get("calls", "[]")) if metadata.get("calls") else []
@@ -203,7 +294,7 @@ def search(query_embedding: list[float], top_k: int = 5) -> list[dict]:
                 "line_start": metadata["line_start"],
                 "line_end": metadata["line_end"],
                 "summary": metadata["summary"],
-                "similarity": round(similarity, 4),
+                "similarity": similarity,
                 "code": document,
                 "calls": calls,
                 "imports": imports,
@@ -225,9 +316,10 @@ def clear_collection() -> None:
         logger.debug("Collection already empty")
 
 
-def get_stats() -> dict:
-    """Get statistics about the collection."""
-    collection = _get_collection()
+def get_stats(collection: Optional[chromadb.Collection] = None) -> dict:
+    """Get statistics about the collection (the current one if None)."""
+    if collection is None:
+        collection = _get_collection()
     return {"total_functions": collection.count()}
 
 
@@ -339,6 +431,85 @@ def get_file_functions(file_path: str) -> list[dict]:
     return output
 
 
+def get_function_names(collection: Optional[chromadb.Collection] = None) -> list[str]:
+    """
+    Return the names of all indexed functions.
+
+    Args:
+        collection: Collection to read (the current one if None).
+    """
+    if collection is None:
+        collection = _get_collection()
+
+    if collection.count() == 0:
+        return []
+
+    all_data = collection.get(include=["metadatas"])
+    return [metadata["name"] for metadata in all_data["metadatas"]]
+
+
+def get_functions_by_name(
+    func_name: str,
+    collection: Optional[chromadb.Collection] = None,
+    query_embedding: Optional[list[float]] = None,
+) -> list[dict]:
+    """
+    Return every function with exactly this name, in search-result format.
+
+    Results carry "exact_match": True. Their "similarity" is the real score
+    against query_embedding, on the same scale as search(); without a query
+    embedding there is nothing to score and the key is omitted.
+
+    Args:
+        func_name: The function name to look up.
+        collection: Collection to read (the current one if None).
+        query_embedding: The embedded query to score the matches against.
+    """
+    if collection is None:
+        collection = _get_collection()
+
+    include = ["documents", "metadatas"]
+    if query_embedding is not None:
+        include.append("embeddings")
+
+    results = collection.get(where={"name": func_name}, include=include)
+
+    similarities = None
+    if query_embedding is not None and len(results["ids"]) > 0:
+        # Stored vectors are unit length; score like search() does:
+        # cosine distance (1 - cos) mapped onto 0..1
+        query = _l2_normalize(query_embedding)
+        stored = np.asarray(results["embeddings"], dtype=np.float32)
+        cosines = stored @ query
+        similarities = np.round(1.0 - (1.0 - cosines.astype(np.float64)) / 2.0, 4).tolist()
+
+    output = []
+    for i, (metadata, document) in enumerate(zip(results["metadatas"], results["documents"])):
+        # Parse JSON fields with backward compatibility
+        calls = json.loads(metadata.get("calls", "[]")) if metadata.get("calls") else []
+        imports = json.loads(metadata.get("imports", "[]")) if metadata.get("imports") else []
+        called_by = json.loads(metadata.get("called_by", "[]")) if metadata.get("called_by") else []
+
+        result = {
+            "function_name": metadata["name"],
+            "file_path": metadata["file_path"],
+            "line_start": metadata["line_start"],
+            "line_end": metadata["line_end"],
+            "summary": metadata.get("summary", ""),
+            "code": document,
+            "calls": calls,
+            "imports": imports,
+            "exported": metadata.get("exported", False),
+            "called_by": called_by,
+            "exact_match": True,
+        }
+        if similarities is not None:
+            result["similarity"] = similarities[i]
+        output.append(result)
+
+    return output
+
+
 def _get_function_by_name(func_name: str) -> Optional[dict]:
     """
     Helper function to get a function by its name.
@@ -5,7 +5,9 @@ Uses sentence-transformers with all-MiniLM-L6-v2 model.
 Runs locally - no API needed, free, fast.
 """
 
-from typing import List
+from typing import List, Union
+
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from .config import get_config
@@ -59,15 +61,18 @@ def embed_code(code: str) -> List[float]:
     return embedding.tolist()
 
 
-def embed_batch(codes: List[str]) -> List[List[float]]:
+def embed_batch(codes: List[str], as_numpy: bool = False) -> Union[List[List[float]], np.ndarray]:
     """
     Generate embeddings for multiple code snippets efficiently.
 
     Args:
         codes: List of code snippets to embed.
+        as_numpy: Return the model's (len(codes), dim) float32 matrix as-is
+                  instead of converting it to nested lists of Python floats.
 
     Returns:
-        List of embedding vectors, one for each input code snippet.
+        List of embedding vectors, one for each input code snippet, or a
+        2-D numpy array of them if as_numpy is True.
     """
     if not codes:
         raise ValueError("Codes list cannot be empty")
@@ -83,6 +88,8 @@ def embed_batch(codes: List[str]) -> List[List[float]]:
         convert_to_numpy=True,
         show_progress_bar=config.embedder.show_progress_bar
     )
+    if as_numpy:
+        return np.asarray(embeddings, dtype=np.float32)
     return [emb.tolist() for emb in embeddings]
 
 
@@ -104,6 +111,29 @@ def embed_query(query: str) -> List[float]:
     return embedding.tolist()
 
 
+def embed_queries(queries: List[str], batch_size: int = 32) -> List[List[float]]:
+    """
+    Generate embeddings for several search queries in one forward pass.
+
+    Args:
+        queries: The search queries to embed.
+        batch_size: Maximum number of queries per model batch.
+
+    Returns:
+        List of embedding vectors, one for each query.
+    """
+    if not queries:
+        raise ValueError("Queries list cannot be empty")
+
+    for i, query in enumerate(queries):
+        if not query or not query.strip():
+            raise ValueError(f"Query at index {i} cannot be empty")
+
+    model = _get_model()
+    embeddings = model.encode(queries, batch_size=batch_size, convert_to_numpy=True)
+    return [emb.tolist() for emb in embeddings]
+
+
 if __name__ == "__main__":
     # Simple test
     test_code = "def hello(): return 'world'"
@@ -5,19 +5,28 @@ Walks directory tree, parses files, embeds code, summarizes,
 and stores everything in the vector database.
 """
 
+import mmap
 import os
 from typing import Dict, List, Any
 
-from .parser import extract_functions, get_supported_extensions
+from .parser import extract_functions_from_bytes, get_supported_extensions
 from .embedder import embed_batch
 from .summarizer import summarize_batch
-from .database import init_db, add_functions, clear_collection, get_stats, compute_called_by
+from .database import (
+    init_db,
+    add_functions,
+    clear_collection,
+    get_stats,
+    compute_called_by,
+    reset_client_cache,
+)
 from .config import get_config
 from .logging_config import get_logger
 from .security import (
     validate_path,
     validate_persist_path,
     is_safe_to_index,
+    path_cache_scope,
     sanitize_path,
     SecurityError,
     PathTraversalError,
@@ -27,6 +36,28 @@ from .security import (
 logger = get_logger(__name__)
 
 
+def _extract_functions_mmap(filepath: str, max_file_size_mb: float) -> List[Dict[str, Any]]:
+    """
+    Parse a file through a read-only memory map instead of read().
+
+    The parser only slices the buffer, so mapping the file avoids copying it
+    into a Python bytes object and lets the kernel page it in on demand.
+    """
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            # mmap cannot map an empty file, and there is nothing to parse
+            return []
+        if size > max_file_size_mb * 1024 * 1024:
+            logger.warning("Skipping %s: exceeds limit of %sMB", filepath, max_file_size_mb)
+            return []
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buf:
+            return extract_functions_from_bytes(buf, filepath, max_file_size_mb)
+    finally:
+        os.close(fd)
+
+
 def index_codebase(
     path: str,
     persist_path: str = None,
@@ -118,8 +149,8 @@ def index_codebase(
     logger.info("Clearing existing collection...")
     clear_collection()
 
-    # Step 3: Get supported extensions
-    supported_extensions = get_supported_extensions()
+    # Step 3: Get supported extensions (frozenset for O(1) membership checks)
+    supported_extensions = frozenset(get_supported_extensions())
     logger.debug("Supported extensions: %s", supported_extensions)
 
     # Step 4: Walk directory and collect all functions
@@ -130,43 +161,49 @@ def index_codebase(
 
     logger.info("Scanning files...")
 
-    skip_dirs = config.indexer.skip_dirs
-    for root, dirs, files in os.walk(abs_path, followlinks=False):
-        # Skip directories we don't want to index
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-
-        # Also skip symlinked directories to prevent loops
-        dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
-
-        for filename in files:
-            # Check if file has a supported extension
-            _, ext = os.path.splitext(filename)
-            if ext not in supported_extensions:
-                continue
-
-            filepath = os.path.join(root, filename)
-
-            # Security check: validate file is safe to index
-            is_safe, reason = is_safe_to_index(filepath, abs_path, max_file_size_mb)
-            if not is_safe:
-                logger.debug("Skipping file (security): %s - %s", filepath, reason)
-                files_skipped_security += 1
-                continue
-
-            try:
-                logger.debug("Parsing: %s", filepath)
-                functions = extract_functions(filepath, max_file_size_mb)
-
-                if functions:
-                    all_functions.extend(functions)
-                    logger.debug("Found %d function(s) in %s", len(functions), filepath)
-
-                files_processed += 1
-
-            except Exception as e:
-                logger.warning("Error parsing %s: %s", filepath, e)
-                files_with_errors += 1
-                continue
+    # Memoize symlink checks for this scan only
+    with path_cache_scope():
+        skip_dirs = config.indexer.skip_dirs
+        for root, dirs, files in os.walk(abs_path, followlinks=False):
+            # Skip directories we don't want to index
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+
+            # Also skip symlinked directories to prevent loops
+            dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+            for filename in files:
+                # Check if file has a supported extension. rfind + slice avoids the
+                # two string allocations os.path.splitext makes for every file.
+                # A leading dot (e.g. ".py") is a hidden file, not an extension.
+                dot = filename.rfind(".")
+                if dot <= 0:
+                    continue
+                if filename[dot:] not in supported_extensions:
+                    continue
+
+                filepath = os.path.join(root, filename)
+
+                # Security check: validate file is safe to index
+                is_safe, reason = is_safe_to_index(filepath, abs_path, max_file_size_mb)
+                if not is_safe:
+                    logger.debug("Skipping file (security): %s - %s", filepath, reason)
+                    files_skipped_security += 1
+                    continue
+
+                try:
+                    logger.debug("Parsing: %s", filepath)
+                    functions = _extract_functions_mmap(filepath, max_file_size_mb)
+
+                    if functions:
+                        all_functions.extend(functions)
+                        logger.debug("Found %d function(s) in %s", len(functions), filepath)
+
+                    files_processed += 1
+
+                except Exception as e:
+                    logger.warning("Error parsing %s: %s", filepath, e)
+                    files_with_errors += 1
+                    continue
 
     logger.info("Files processed: %d", files_processed)
     if files_with_errors > 0:
@@ -190,9 +227,12 @@ def index_codebase(
     try:
         # Extract code from all functions for embedding
         codes = [f["code"] for f in all_functions]
-        embeddings = embed_batch(codes)
 
-        # Add embeddings to function dicts
+        # Keep embeddings as the model's contiguous float32 matrix; no
+        # N Python lists of boxed floats are ever built
+        embeddings = embed_batch(codes, as_numpy=True)
+
+        # Add embeddings to function dicts (row views, not copies)
         for func, embedding in zip(all_functions, embeddings):
             func["embedding"] = embedding
 
@@ -233,7 +273,7 @@ def index_codebase(
     logger.info("Storing functions in database...")
 
     try:
-        add_functions(all_functions)
+        add_functions(all_functions, embeddings=embeddings)
         logger.info("Stored %d functions", len(all_functions))
 
     except Exception as e:
@@ -254,6 +294,9 @@ def index_codebase(
     stats = get_stats()
     logger.debug("Database stats: %s", stats)
 
+    # Searches reopen the rebuilt database rather than reuse pre-index handles
+    reset_client_cache()
+
     result = {
         "status": "success",
         "files_processed": files_processed,
@@ -2,7 +2,9 @@
 Logging configuration module for WashedMCP.
 
 Provides a configured logger factory function with support for both
-console and file output.
+console and file output. Records are handed to a QueueHandler and written
+by a background QueueListener thread, so logging never blocks the caller
+on stderr or file I/O.
 
 Usage:
     from .logging_config import get_logger
@@ -14,8 +16,11 @@ Usage:
     logger.error("Error message")
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from typing import Optional
 
@@ -24,10 +29,27 @@ from typing import Optional
 DEFAULT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
 DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Log file rotation limits
+LOG_FILE_MAX_BYTES = 50 * 1024 * 1024  # 50MB per file
+LOG_FILE_BACKUP_COUNT = 5
+
 # Module-level state
 _configured = False
 _log_file_path: Optional[str] = None
 _log_level = logging.INFO
+_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registered = False
+
+
+def _stop_listener() -> None:
+    """Stop the background log listener, flushing any queued records."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def configure_logging(
@@ -45,11 +67,12 @@ def configure_logging(
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional path to log file. If provided, logs will be
-                  written to both console and file.
+                  written to both console and file. The file is rotated at
+                  LOG_FILE_MAX_BYTES, keeping LOG_FILE_BACKUP_COUNT backups.
         format_string: Log message format string
         date_format: Date format string for timestamps
     """
-    global _configured, _log_file_path, _log_level
+    global _configured, _log_file_path, _log_level, _listener, _atexit_registered
 
     _log_level = level
     _log_file_path = log_file
@@ -58,17 +81,20 @@ def configure_logging(
     root_logger = logging.getLogger("washedmcp")
     root_logger.setLevel(level)
 
-    # Remove existing handlers to avoid duplicates
+    # Flush and stop the previous listener, then remove existing handlers
+    # to avoid duplicates
+    _stop_listener()
     root_logger.handlers.clear()
 
     # Create formatter
     formatter = logging.Formatter(format_string, datefmt=date_format)
 
     # Console handler - outputs to stderr
+    # Level filtering happens on the logger and queue handler (on the calling
+    # thread), so the listener-side handlers accept everything they receive
     console_handler = logging.StreamHandler(sys.stderr)
-    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler (optional)
     if log_file:
@@ -77,10 +103,31 @@ def configure_logging(
         if log_dir:
             os.makedirs(log_dir, exist_ok=True)
 
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(level)
+        # Rotate instead of growing forever; delay=True defers opening the
+        # file until the first record is written
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # The logger only enqueues records; formatting and I/O happen on the
+    # listener's daemon thread
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    root_logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+    if not _atexit_registered:
+        atexit.register(_stop_listener)
+        _atexit_registered = True
 
     _configured = True
 
@@ -13,6 +13,11 @@ Features:
 import sys
 import os
 import asyncio
+import contextlib
+import json
+import tempfile
+from dataclasses import dataclass, fields
+from pathlib import Path
 
 # Python version check
 if sys.version_info < (3, 10):
@@ -24,7 +29,17 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from .async_indexer import index_codebase_async
+from .background import submit_index_job, get_active_indexing, wait_index_status_change
+from .database import get_stats
+from .embedder import embed_query
 from .logging_config import get_logger
+from .searcher import (
+    SEARCH_WORKERS,
+    asearch_code_with_context,
+    get_search_executor,
+    is_indexed,
+)
 from .security import (
     sanitize_path,
     validate_query,
@@ -32,6 +47,8 @@ from .security import (
     InputValidationError,
     MAX_QUERY_LENGTH,
 )
+from .stats import get_token_savings_summary, reset_stats
+from .toon_formatter import format_results_rich
 
 logger = get_logger(__name__)
 
@@ -44,6 +61,164 @@ _indexed_project_path = None
 # Default timeout for indexing operations (10 minutes)
 DEFAULT_INDEX_TIMEOUT = 600.0
 
+# Bounds for client-supplied tool arguments
+MAX_INDEX_TIMEOUT = 3600.0  # 1 hour
+MAX_SEARCH_DEPTH = 3  # Deeper expansion has significant performance cost
+MAX_SEARCH_TOP_K = 50
+DEFAULT_STATUS_WAIT = 30.0
+MAX_STATUS_WAIT = 120.0
+
+
+class _ToolArgs:
+    """Base for parsed tool arguments; unknown keys in the request are ignored."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_arguments(cls, arguments: dict):
+        return cls(**{f.name: arguments[f.name] for f in fields(cls) if f.name in arguments})
+
+
+@dataclass(slots=True)
+class IndexArgs(_ToolArgs):
+    """Parsed index_codebase arguments; timeout is clamped on creation."""
+
+    path: str | None = None
+    background: bool = False
+    timeout: float = DEFAULT_INDEX_TIMEOUT
+
+    def __post_init__(self):
+        if not isinstance(self.timeout, (int, float)) or self.timeout <= 0:
+            self.timeout = DEFAULT_INDEX_TIMEOUT
+        elif self.timeout > MAX_INDEX_TIMEOUT:
+            self.timeout = MAX_INDEX_TIMEOUT
+
+
+@dataclass(slots=True)
+class SearchArgs(_ToolArgs):
+    """Parsed search_code arguments; depth and top_k are clamped on creation."""
+
+    query: str | None = None
+    top_k: int = 5
+    depth: int = 1
+
+    def __post_init__(self):
+        if not isinstance(self.depth, int) or self.depth < 0:
+            self.depth = 1
+        elif self.depth > MAX_SEARCH_DEPTH:
+            self.depth = MAX_SEARCH_DEPTH
+
+        if not isinstance(self.top_k, int) or self.top_k < 1:
+            self.top_k = 5
+        elif self.top_k > MAX_SEARCH_TOP_K:
+            self.top_k = MAX_SEARCH_TOP_K
+
+
+@dataclass(slots=True)
+class StatusWaitArgs(_ToolArgs):
+    """Parsed get_index_status_long_poll arguments; timeout is clamped on creation."""
+
+    timeout: float = DEFAULT_STATUS_WAIT
+
+    def __post_init__(self):
+        if not isinstance(self.timeout, (int, float)) or self.timeout < 0:
+            self.timeout = DEFAULT_STATUS_WAIT
+        elif self.timeout > MAX_STATUS_WAIT:
+            self.timeout = MAX_STATUS_WAIT
+
+
+# Dedicated pool for search work, shared with the searcher's query batcher
+_SEARCH_POOL = get_search_executor()
+
+# Bounds in-flight searches so bursts queue here instead of in the pool
+_search_semaphore = None
+
+
+def _get_search_semaphore() -> asyncio.Semaphore:
+    """Get or create the search admission semaphore lazily."""
+    global _search_semaphore
+    if _search_semaphore is None:
+        _search_semaphore = asyncio.Semaphore(SEARCH_WORKERS * 2)
+    return _search_semaphore
+
+
+# Remembers the last indexed project so startup can warm its database
+SERVER_STATE_PATH = Path.home() / ".washedmcp" / "server_state.json"
+
+# Reference to the startup warm-up task (keeps it from being garbage collected)
+_warmup_task = None
+
+
+def _save_server_state(project_path: str) -> None:
+    """
+    Record the last indexed project path (blocking; run it off the event loop).
+
+    Written to a temporary sibling and renamed into place, like stats.json,
+    so a crash or a concurrent server never leaves a truncated file.
+    """
+    try:
+        SERVER_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=SERVER_STATE_PATH.parent, prefix=".server_state-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"last_project_path": project_path}, f)
+            os.replace(tmp_path, SERVER_STATE_PATH)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug("Failed to save server state: %s", e)
+
+
+def _load_server_state() -> str | None:
+    """Return the last indexed project path, if recorded."""
+    try:
+        with open(SERVER_STATE_PATH, "r") as f:
+            return json.load(f).get("last_project_path")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _warmup() -> str | None:
+    """
+    Load the embedding model and open the last project's database.
+
+    Returns the last indexed project path if it still exists and is
+    indexed, so searches after a restart target the warmed database.
+    """
+    embed_query("warmup")
+    logger.debug("Embedding model warmed up")
+
+    project_path = _load_server_state()
+    if not project_path or not os.path.isdir(project_path):
+        return None
+
+    # Opens and memoizes the Chroma client for this project
+    if not is_indexed(project_path=project_path):
+        return None
+    logger.debug("Database warmed up for %s", project_path)
+    return project_path
+
+
+async def _run_warmup() -> None:
+    """Run the warm-up off the event loop, never failing the server."""
+    global _indexed_project_path
+
+    loop = asyncio.get_running_loop()
+    try:
+        project_path = await loop.run_in_executor(_SEARCH_POOL, _warmup)
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
+        return
+
+    # An index_codebase call made during warm-up takes precedence
+    if project_path and _indexed_project_path is None:
+        _indexed_project_path = project_path
+        logger.info("Restored last indexed project: %s", project_path)
+
 
 @server.list_tools()
 async def list_tools():
@@ -87,6 +262,20 @@ async def list_tools():
             description="Check if codebase is indexed.",
             inputSchema={"type": "object", "properties": {}}
         ),
+        Tool(
+            name="get_index_status_long_poll",
+            description="Wait for indexing progress to change (or timeout), then report status. Use instead of polling get_index_status.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "timeout": {
+                        "type": "number",
+                        "description": "Maximum seconds to wait for a change. Default: 30",
+                        "default": 30
+                    }
+                }
+            }
+        ),
         Tool(
             name="get_token_savings",
             description="Show cumulative token savings from using TOON format vs JSON across all searches.",
@@ -112,9 +301,9 @@ async def _index_foreground(path: str, timeout: float) -> str:
     """
     global _indexed_project_path
 
-    from .async_indexer import index_codebase_async
-
-    _indexed_project_path = os.path.abspath(path)
+    _indexed_project_path = await asyncio.get_running_loop().run_in_executor(
+        None, os.path.abspath, path
+    )
 
     try:
         res = await asyncio.wait_for(
@@ -123,6 +312,9 @@ async def _index_foreground(path: str, timeout: float) -> str:
         )
 
         if res["status"] == "success":
+            await asyncio.get_running_loop().run_in_executor(
+                None, _save_server_state, _indexed_project_path
+            )
             return f"Indexed {res['functions_indexed']} functions from {res['files_processed']} files"
         else:
             return f"Error: {res.get('error', 'Unknown')}"
@@ -143,8 +335,6 @@ async def _index_background(path: str) -> str:
     """
     global _indexed_project_path
 
-    from .background import submit_index_job, get_active_indexing
-
     # Check if there's already an active indexing job
     active = await get_active_indexing()
     if active:
@@ -157,9 +347,14 @@ async def _index_background(path: str) -> str:
             f"Use get_index_status to check progress."
         )
 
-    _indexed_project_path = os.path.abspath(path)
+    _indexed_project_path = await asyncio.get_running_loop().run_in_executor(
+        None, os.path.abspath, path
+    )
 
     job_id = await submit_index_job(path, skip_summarize=True)
+    await asyncio.get_running_loop().run_in_executor(
+        None, _save_server_state, _indexed_project_path
+    )
 
     return (
         f"Background indexing started.\n"
@@ -170,10 +365,6 @@ async def _index_background(path: str) -> str:
 
 async def _get_index_status_text() -> str:
     """Get formatted index status text."""
-    from .searcher import is_indexed
-    from .database import get_stats
-    from .background import get_active_indexing
-
     # First check for active background job
     active_job = await get_active_indexing()
     if active_job:
@@ -210,48 +401,34 @@ async def call_tool(name: str, arguments: dict):
 
     try:
         if name == "index_codebase":
-            path = arguments.get("path")
-            if not path:
+            args = IndexArgs.from_arguments(arguments)
+            if not args.path:
                 return [TextContent(type="text", text="Error: path required")]
 
             # Validate and sanitize the path
             try:
-                path = sanitize_path(path)
+                path = sanitize_path(args.path)
             except SecurityError as e:
                 return [TextContent(type="text", text=f"Error: Invalid path - {e}")]
 
-            background = arguments.get("background", False)
-            timeout = arguments.get("timeout", DEFAULT_INDEX_TIMEOUT)
-
-            # Validate timeout
-            if not isinstance(timeout, (int, float)) or timeout <= 0:
-                timeout = DEFAULT_INDEX_TIMEOUT
-            elif timeout > 3600:  # Max 1 hour
-                timeout = 3600
-
-            if background:
+            if args.background:
                 text = await _index_background(path)
             else:
-                text = await _index_foreground(path, timeout)
+                text = await _index_foreground(path, args.timeout)
 
         elif name == "search_code":
-            # Lazy imports
-            from .searcher import search_code_with_context, is_indexed
-            from .toon_formatter import format_results_rich
-
-            query = arguments.get("query")
-            if not query:
+            args = SearchArgs.from_arguments(arguments)
+            if not args.query:
                 return [TextContent(type="text", text="Error: query required")]
 
             # Validate and sanitize the query
             try:
-                query = validate_query(query, MAX_QUERY_LENGTH)
+                query = validate_query(args.query, MAX_QUERY_LENGTH)
             except InputValidationError as e:
                 return [TextContent(type="text", text=f"Error: Invalid query - {e}")]
 
             if not is_indexed(project_path=_indexed_project_path):
                 # Check if indexing is in progress
-                from .background import get_active_indexing
                 active = await get_active_indexing()
                 if active:
                     text = (
@@ -261,31 +438,18 @@ async def call_tool(name: str, arguments: dict):
                 else:
                     text = "Not indexed. Run index_codebase first."
             else:
-                # Validate and sanitize depth parameter
-                depth = arguments.get("depth", 1)
-                if not isinstance(depth, int) or depth < 0:
-                    depth = 1
-                elif depth > 3:  # Limit max depth to prevent performance issues
-                    depth = 3
-
-                # Validate and sanitize top_k parameter
-                top_k = arguments.get("top_k", 5)
-                if not isinstance(top_k, int) or top_k < 1:
-                    top_k = 5
-                elif top_k > 50:  # Limit max results
-                    top_k = 50
-
-                # Run search in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,
-                    lambda: search_code_with_context(
+                async with _get_search_semaphore():
+                    # Blocking phases run on the dedicated pool; the query is
+                    # embedded in a batch with any concurrent searches
+                    result = await asearch_code_with_context(
                         query,
-                        top_k=top_k,
-                        depth=depth,
-                        project_path=_indexed_project_path
+                        top_k=args.top_k,
+                        depth=args.depth,
+                        project_path=_indexed_project_path,
+                        executor=_SEARCH_POOL,
+                        # format_results_rich only shows the best match's context
+                        context_top_n=1,
                     )
-                )
 
                 if result["results"]:
                     text = format_results_rich(result["results"], result["context"])
@@ -295,9 +459,14 @@ async def call_tool(name: str, arguments: dict):
         elif name == "get_index_status":
             text = await _get_index_status_text()
 
-        elif name == "get_token_savings":
-            from .stats import get_token_savings_summary, reset_stats
+        elif name == "get_index_status_long_poll":
+            args = StatusWaitArgs.from_arguments(arguments)
+            # Only block while there is something to wait for
+            if await get_active_indexing():
+                await wait_index_status_change(args.timeout)
+            text = await _get_index_status_text()
 
+        elif name == "get_token_savings":
             if arguments.get("reset", False):
                 reset_stats()
                 text = "Token savings statistics have been reset."
@@ -315,7 +484,13 @@ async def call_tool(name: str, arguments: dict):
 
 
 async def _async_main():
+    global _warmup_task
+
     logger.info("Starting WashedMCP server")
+
+    # Pay the model load (and last project's DB open) at startup, not on the first query
+    _warmup_task = asyncio.create_task(_run_warmup())
+
     async with stdio_server() as (read_stream, write_stream):
         await server.run(read_stream, write_stream, server.create_initialization_options())
 
@@ -948,11 +948,9 @@ def extract_functions(file_path: str, max_file_size_mb: float = MAX_FILE_SIZE_MB
         file_path = sanitize_path(file_path)
 
         _, ext = os.path.splitext(file_path)
-        extension_map = _get_extension_map()
-        if ext not in extension_map:
+        if ext not in _get_extension_map():
             return []
 
-        lang_name, language = extension_map[ext]
         abs_path = os.path.abspath(file_path)
 
         # Validate file size before reading
@@ -965,13 +963,7 @@ def extract_functions(file_path: str, max_file_size_mb: float = MAX_FILE_SIZE_MB
         with open(abs_path, "rb") as f:
             source_code = f.read()
 
-        parser = _create_parser(language)
-        tree = parser.parse(source_code)
-
-        if lang_name == "python":
-            return _find_python_entities(tree.root_node, source_code, abs_path)
-        else:
-            return _find_js_entities(tree.root_node, source_code, abs_path, lang_name)
+        return extract_functions_from_bytes(source_code, abs_path, max_file_size_mb)
 
     except SecurityError as e:
         logger.warning("Security error processing %s: %s", file_path, e)
@@ -984,6 +976,50 @@ def extract_functions(file_path: str, max_file_size_mb: float = MAX_FILE_SIZE_MB
         return []
 
 
+def extract_functions_from_bytes(
+    source_code,
+    file_path: str,
+    max_file_size_mb: float = MAX_FILE_SIZE_MB
+) -> list[dict]:
+    """
+    Extract all functions, classes, and methods from an in-memory source buffer.
+
+    Same as extract_functions(), but takes the file contents directly so callers
+    can hand in a read-only mmap instead of paying for a read() copy. The buffer
+    is only sliced, never copied as a whole, so pages are faulted in on demand.
+
+    Args:
+        source_code: bytes-like source (bytes or mmap.mmap opened ACCESS_READ).
+        file_path: Absolute path of the file the buffer came from. Used for the
+                   language lookup and stored in each result's "file_path".
+        max_file_size_mb: Maximum buffer size in MB to process (default: 10MB).
+
+    Returns:
+        List of entity dictionaries (see extract_functions).
+        Returns empty list if the buffer is too large or the extension is unsupported.
+    """
+    _, ext = os.path.splitext(file_path)
+    extension_map = _get_extension_map()
+    if ext not in extension_map:
+        return []
+
+    if len(source_code) > max_file_size_mb * 1024 * 1024:
+        logger.warning(
+            "Skipping %s: %d bytes exceeds limit of %sMB",
+            file_path, len(source_code), max_file_size_mb
+        )
+        return []
+
+    lang_name, language = extension_map[ext]
+
+    parser = _create_parser(language)
+    tree = parser.parse(source_code)
+
+    if lang_name == "python":
+        return _find_python_entities(tree.root_node, source_code, file_path)
+    else:
+        return _find_js_entities(tree.root_node, source_code, file_path, lang_name)
+
 if __name__ == "__main__":
     import json
     import sys
@@ -2,10 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
 import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
 from .config import get_config
-from .embedder import embed_query
-from .database import init_db, search as db_search, get_stats, get_function_context
+from .embedder import embed_query, embed_queries
+from .database import (
+    init_db,
+    search as db_search,
+    get_stats,
+    get_function_context,
+    get_function_names,
+    get_functions_by_name,
+)
 from .logging_config import get_logger
 from .security import (
     validate_query,
@@ -17,13 +36,602 @@ from .security import (
 
 logger = get_logger(__name__)
 
+# On-disk query embedding cache, stored next to the Chroma files
+QUERY_CACHE_FILENAME = "query_embeddings.sqlite"
+
+_query_cache_conns: dict[str, sqlite3.Connection] = {}
+_query_cache_lock = threading.Lock()
+
+# In-process LRU in front of the on-disk cache:
+# (query, model name, persist_path) -> embedding tuple, most recent last
+QUERY_EMBEDDING_LRU_SIZE = 1024
+
+_query_lru: "OrderedDict[tuple, tuple]" = OrderedDict()
+_query_lru_lock = threading.Lock()
+
+# Semantic result cache: serve a prior query's results when a new query is
+# close enough in embedding space
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL_SECONDS = 300.0
+SEMANTIC_CACHE_MAX_SIZE = 512
+
+# Number of top matches that get context expansion in asearch_code_with_context
+CONTEXT_EXPANSION_TOP_N = 3
+
+# persist_path -> (_index_version at check time, indexed?)
+_is_indexed_cache: dict[str, tuple[tuple, bool]] = {}
+
+# persist_path -> (_index_version at build time, name or method name -> names)
+_name_index_cache: dict[str, tuple[tuple, dict[str, set[str]]]] = {}
+
+# Query tokens that may name a function directly: (dotted) words, with an
+# optional trailing "()"
+_NAME_TOKEN_RE = re.compile(r"([A-Za-z_][A-Za-z_0-9]*(?:\.[A-Za-z_][A-Za-z_0-9]*)*)(\(\))?")
+_CAMEL_CASE_RE = re.compile(r"[a-z0-9][A-Z]")
+
+# Micro-batching of concurrent query embeddings
+QUERY_BATCH_MAX_SIZE = 32
+QUERY_BATCH_MAX_WAIT_SECONDS = 0.005
+
+# Dedicated pool for search work (batched query embedding, vector search,
+# context expansion), kept apart from the loop's default executor
+SEARCH_WORKERS = max(2, (os.cpu_count() or 2) // 2)
+
+_SEARCH_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=SEARCH_WORKERS,
+    thread_name_prefix="wmcp-search",
+)
+
+
+def get_search_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the thread pool that runs blocking search work."""
+    return _SEARCH_POOL
+
+
+def _load_query_cache(persist_path: str) -> sqlite3.Connection:
+    """
+    Open (or reuse) the query embedding cache for a persist path.
+
+    Must be called with _query_cache_lock held.
+    """
+    conn = _query_cache_conns.get(persist_path)
+    if conn is None:
+        conn = sqlite3.connect(
+            os.path.join(persist_path, QUERY_CACHE_FILENAME),
+            check_same_thread=False,
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings "
+            "(hash TEXT, model TEXT, vec BLOB, PRIMARY KEY (hash, model))"
+        )
+        conn.commit()
+        _query_cache_conns[persist_path] = conn
+    return conn
+
+
+def _read_cached_embedding(key: str, model_name: str, persist_path: str):
+    """Return a cached embedding from SQLite, or None on a miss."""
+    try:
+        with _query_cache_lock:
+            row = _load_query_cache(persist_path).execute(
+                "SELECT vec FROM query_embeddings WHERE hash = ? AND model = ?",
+                (key, model_name),
+            ).fetchone()
+        if row is not None:
+            return tuple(np.frombuffer(row[0], dtype=np.float32).tolist())
+    except sqlite3.Error as e:
+        logger.debug("Query cache lookup failed: %s", e)
+    return None
+
+
+def _write_cached_embedding(key: str, model_name: str, persist_path: str, vec: np.ndarray) -> None:
+    """Store an embedding in SQLite, ignoring cache errors."""
+    try:
+        with _query_cache_lock:
+            conn = _load_query_cache(persist_path)
+            conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (hash, model, vec) VALUES (?, ?, ?)",
+                (key, model_name, vec.tobytes()),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.debug("Query cache store failed: %s", e)
+
+
+def _query_key(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _lru_get(lru_key: tuple):
+    """Return an embedding from the in-process LRU, or None on a miss."""
+    with _query_lru_lock:
+        vec = _query_lru.get(lru_key)
+        if vec is not None:
+            _query_lru.move_to_end(lru_key)
+        return vec
+
+
+def _lru_put(lru_key: tuple, vec: tuple) -> None:
+    """Remember an embedding in the in-process LRU, evicting the oldest."""
+    with _query_lru_lock:
+        _query_lru[lru_key] = vec
+        _query_lru.move_to_end(lru_key)
+        if len(_query_lru) > QUERY_EMBEDDING_LRU_SIZE:
+            _query_lru.popitem(last=False)
+
+
+def _clear_query_lru() -> None:
+    """Drop the in-process query embeddings (the on-disk cache is kept)."""
+    with _query_lru_lock:
+        _query_lru.clear()
+
+
+def _embed_query_cached(query: str, model_name: str, persist_path: str) -> tuple:
+    """
+    Embed a query, consulting the caches before running the model.
+
+    The in-process LRU serves exact repeats; the SQLite sidecar keyed by
+    sha256(query) + model name survives restarts.
+    """
+    lru_key = (query, model_name, persist_path)
+    cached = _lru_get(lru_key)
+    if cached is not None:
+        return cached
+
+    key = _query_key(query)
+    cached = _read_cached_embedding(key, model_name, persist_path)
+    if cached is None:
+        vec = np.asarray(embed_query(query), dtype=np.float32)
+        _write_cached_embedding(key, model_name, persist_path, vec)
+        cached = tuple(vec.tolist())
+
+    _lru_put(lru_key, cached)
+    return cached
+
+
+def get_query_embedding(query: str, persist_path: str) -> list[float]:
+    """
+    Get the embedding for a query, using the in-process and on-disk caches.
+
+    Args:
+        query: Validated search query
+        persist_path: Validated ChromaDB persistence directory (hosts the cache file)
+
+    Returns:
+        The query embedding vector
+    """
+    model_name = get_config().embedder.model_name
+    return list(_embed_query_cached(query, model_name, persist_path))
+
+
+def _embed_query_batch(items: list[tuple[str, str]]) -> list[list[float]]:
+    """
+    Embed (query, persist_path) pairs, running the model once for all misses.
+
+    Queries already in the in-process LRU or the on-disk cache are served
+    from them; the rest are encoded together and written back to both.
+    """
+    model_name = get_config().embedder.model_name
+    vectors: list = [None] * len(items)
+    misses: dict[str, list[int]] = {}
+
+    for i, (query, persist_path) in enumerate(items):
+        lru_key = (query, model_name, persist_path)
+        cached = _lru_get(lru_key)
+        if cached is None:
+            cached = _read_cached_embedding(_query_key(query), model_name, persist_path)
+            if cached is not None:
+                _lru_put(lru_key, cached)
+        if cached is not None:
+            vectors[i] = list(cached)
+        else:
+            misses.setdefault(query, []).append(i)
+
+    if misses:
+        queries = list(misses)
+        logger.debug("Embedding %d queries in one batch", len(queries))
+        embeddings = np.asarray(
+            embed_queries(queries, batch_size=QUERY_BATCH_MAX_SIZE), dtype=np.float32
+        )
+        for query, vec in zip(queries, embeddings):
+            key = _query_key(query)
+            as_tuple = tuple(vec.tolist())
+            for i in misses[query]:
+                _write_cached_embedding(key, model_name, items[i][1], vec)
+                _lru_put((query, model_name, items[i][1]), as_tuple)
+                vectors[i] = list(as_tuple)
+
+    return vectors
+
+
+class _QueryBatcher:
+    """
+    Coalesce concurrent query embeddings into single model calls.
+
+    Queries already in the in-process LRU are answered immediately. Other
+    callers enqueue (query, persist_path, future); a background task waits
+    up to max_wait for more requests, embeds up to max_batch of them at once
+    on the search pool and resolves each future.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = QUERY_BATCH_MAX_SIZE,
+        max_wait: float = QUERY_BATCH_MAX_WAIT_SECONDS,
+    ):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def embed(self, query: str, persist_path: str) -> list[float]:
+        cached = _lru_get((query, get_config().embedder.model_name, persist_path))
+        if cached is not None:
+            return list(cached)
+
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        await self._queue.put((query, persist_path, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [item for item in await self._collect() if not item[2].done()]
+            if not batch:
+                continue
+
+            try:
+                vectors = await loop.run_in_executor(
+                    _SEARCH_POOL, _embed_query_batch, [(query, path) for query, path, _ in batch]
+                )
+            except Exception as e:
+                logger.debug("Batched query embedding failed: %s", e)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), vec in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vec)
+
+
+_query_batcher = _QueryBatcher()
+
+
+async def embed_query_batched(
+    query: str,
+    persist_path: str = None,
+    project_path: str = None
+) -> list[float]:
+    """
+    Embed a query, batching it with other queries awaiting at the same time.
+
+    Args:
+        query: Natural language search query
+        persist_path: Path to the ChromaDB persistence directory.
+                      If None and project_path provided, derives from project_path.
+        project_path: Path to the indexed project (used to derive persist_path)
+
+    Returns:
+        The query embedding vector
+
+    Raises:
+        InputValidationError: If query is invalid.
+        SecurityError: If paths are invalid.
+    """
+    query = validate_query(query)
+    # abspath and path validation touch the filesystem; keep them off the loop
+    persist_path = await asyncio.get_running_loop().run_in_executor(
+        None, _resolve_persist_path, persist_path, project_path
+    )
+    return await _query_batcher.embed(query, persist_path)
+
+
+def _resolve_persist_path(
+    persist_path: str = None,
+    project_path: str = None,
+    log_level: int = logging.WARNING
+) -> str:
+    """
+    Derive and validate the ChromaDB persistence directory.
+
+    Args:
+        persist_path: Explicit persistence directory, if any.
+        project_path: Indexed project to derive the directory from.
+        log_level: Level for logging an invalid path before re-raising.
+
+    Raises:
+        SecurityError: If paths are invalid.
+    """
+    config = get_config()
+
+    if persist_path is None and project_path:
+        try:
+            project_path = sanitize_path(project_path)
+        except SecurityError as e:
+            logger.log(log_level, "Invalid project path: %s", e)
+            raise
+        persist_path = os.path.join(os.path.abspath(project_path), config.database.default_persist_path)
+    elif persist_path is None:
+        persist_path = config.database.default_persist_path  # Fallback using config
+
+    try:
+        return validate_persist_path(persist_path)
+    except SecurityError as e:
+        logger.log(log_level, "Invalid persist path: %s", e)
+        raise
+
+
+def _index_version(persist_path: str) -> tuple:
+    """
+    Return a cheap fingerprint of the on-disk index for cache scoping.
+
+    Any write to the Chroma SQLite file (or its WAL) changes the fingerprint,
+    so cached results never outlive a reindex.
+    """
+    version = []
+    for name in ("chroma.sqlite3", "chroma.sqlite3-wal"):
+        try:
+            version.append(os.stat(os.path.join(persist_path, name)).st_mtime_ns)
+        except OSError:
+            version.append(0)
+    return tuple(version)
+
+
+class _QueryCache:
+    """
+    Approximate cache of search results keyed by query embedding.
+
+    Stores L2-normalized query vectors as the rows of one preallocated
+    (max_size, dim) float32 matrix; a lookup is a single matrix-vector
+    product over the filled rows, and the best row within the same scope is a
+    hit if its cosine similarity clears the threshold and it has not expired.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = SEMANTIC_CACHE_TTL_SECONDS,
+        max_size: int = SEMANTIC_CACHE_MAX_SIZE,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # Allocated on first insert, once the embedding dimension is known
+        self._matrix: np.ndarray | None = None
+        # Parallel to the filled rows of _matrix: [scope, results, last_used, created]
+        self._entries: list[list] = []
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray | None:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0:
+            return None
+        return vec / norm
+
+    def get(self, embedding, scope: tuple):
+        """Return cached results for a near-duplicate query in scope, or None."""
+        vec = self._normalize(embedding)
+        if vec is None:
+            return None
+
+        with self._lock:
+            size = len(self._entries)
+            if size == 0 or self._matrix.shape[1] != vec.shape[0]:
+                return None
+
+            scores = self._matrix[:size] @ vec
+            in_scope = np.fromiter(
+                (entry[0] == scope for entry in self._entries),
+                dtype=bool,
+                count=size,
+            )
+            scores[~in_scope] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            entry = self._entries[best]
+            now = time.monotonic()
+            if now - entry[3] > self.ttl:
+                return None
+
+            entry[2] = now
+            return entry[1]
+
+    def put(self, embedding, scope: tuple, results) -> None:
+        """Remember the results for a query, evicting the least recently used."""
+        vec = self._normalize(embedding)
+        if vec is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vec.shape[0]:
+                self._matrix = np.empty((self.max_size, vec.shape[0]), dtype=np.float32)
+                self._entries = []
+
+            if len(self._entries) >= self.max_size:
+                self._evict(now)
+
+            self._matrix[len(self._entries)] = vec
+            self._entries.append([scope, results, now, now])
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and the LRU tail, compacting the kept rows."""
+        keep = [
+            i for i, entry in enumerate(self._entries)
+            if now - entry[3] <= self.ttl
+        ]
+        if len(keep) >= self.max_size:
+            keep.sort(key=lambda i: self._entries[i][2])
+            keep = sorted(keep[len(keep) - self.max_size + 1:])
+
+        self._entries = [self._entries[i] for i in keep]
+        # Fancy indexing copies first, so overlapping rows are safe
+        self._matrix[:len(keep)] = self._matrix[keep]
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_semantic_cache = _QueryCache()
+
+
+def _name_index(collection, persist_path: str) -> dict[str, set[str]]:
+    """
+    Return the function-name lookup for a persist path, rebuilding on reindex.
+
+    Methods are stored as "Class.method", so both the full name and the
+    method name are indexed. Names are case-sensitive, like the code.
+    """
+    version = _index_version(persist_path)
+    cached = _name_index_cache.get(persist_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index: dict[str, set[str]] = {}
+    for name in get_function_names(collection):
+        index.setdefault(name, set()).add(name)
+        index.setdefault(name.rsplit(".", 1)[-1], set()).add(name)
+
+    _name_index_cache[persist_path] = (version, index)
+    return index
+
+
+def _identifier_tokens(query: str) -> list[str]:
+    """
+    Return the query tokens written like code identifiers.
+
+    A token counts when it contains "_" or ".", is camelCase, or is followed
+    by "()"; plain words ("parse", "search") are left to semantic search.
+    """
+    tokens = []
+    for match in _NAME_TOKEN_RE.finditer(query):
+        token, call = match.groups()
+        if call or "_" in token or "." in token or _CAMEL_CASE_RE.search(token):
+            tokens.append(token)
+    return tokens
+
+
+def _direct_names(query: str, collection, persist_path: str) -> list[str]:
+    """
+    Return indexed function names written verbatim as identifiers in the query.
+
+    A failed lookup only disables name matching; semantic search still runs.
+    """
+    tokens = _identifier_tokens(query)
+    if not tokens:
+        return []
+    try:
+        index = _name_index(collection, persist_path)
+        names: list[str] = []
+        for token in tokens:
+            for name in sorted(index.get(token, ())):
+                if name not in names:
+                    names.append(name)
+        return names
+    except Exception as e:
+        logger.debug("Name lookup failed for query '%s': %s", query, e)
+        return []
+
+
+def _name_hits(names: list[str], collection, top_k: int) -> list[dict]:
+    """
+    Fetch up to top_k functions named in the query, flagged "exact_match".
+
+    No query embedding is involved, so hits carry no "similarity". A failed
+    lookup only disables name matching; semantic search still runs.
+    """
+    hits: list[dict] = []
+    seen = set()
+    try:
+        for name in names:
+            for r in get_functions_by_name(name, collection):
+                key = (r["file_path"], r["function_name"], r["line_start"])
+                if key not in seen:
+                    seen.add(key)
+                    hits.append(r)
+            if len(hits) >= top_k:
+                break
+    except Exception as e:
+        logger.debug("Name lookup failed for %s: %s", names, e)
+        return []
+    return hits[:top_k]
+
+
+def _open_with_name_hits(query: str, persist_path: str, top_k: int):
+    """Open the database and fetch the functions named in the query."""
+    collection = init_db(persist_path=persist_path)
+    names = _direct_names(query, collection, persist_path)
+    return collection, _name_hits(names, collection, top_k) if names else []
+
+
+def _with_context(results: list[dict], depth: int):
+    """Wrap results with the best match's context when depth > 0."""
+    if depth <= 0:
+        return results
+
+    context = None
+    if results:
+        best_match = results[0]
+        func_name = best_match["function_name"]
+        context = get_function_context(func_name, depth)
+    return {
+        "results": results,
+        "context": context
+    }
+
+
+def _copy_results(results):
+    """Copy the result containers so callers cannot mutate cached state."""
+    if isinstance(results, dict):
+        return {
+            "results": list(results["results"]),
+            "context": results["context"],
+        }
+    return list(results)
+
 
 def search_code(
     query: str,
     persist_path: str = None,
     top_k: int = None,
     depth: int = None,
-    project_path: str = None
+    project_path: str = None,
+    query_embedding: list[float] = None
 ):
     """
     Search for code snippets semantically similar to the query.
@@ -35,6 +643,8 @@ def search_code(
         top_k: Number of results to return (uses config default if None)
         depth: If > 0, return expanded context for the best match (uses config default if None)
         project_path: Path to the indexed project (used to derive persist_path)
+        query_embedding: Precomputed embedding for the query (e.g. from
+                         embed_query_batched); embedded here if None
 
     Returns:
         List of matching code snippets with metadata and similarity scores,
@@ -62,47 +672,111 @@ def search_code(
     logger.debug("Searching for query: '%s' (top_k=%d, depth=%d)", query, top_k, depth)
 
     # Derive persist_path from project_path if not explicitly provided
-    if persist_path is None and project_path:
-        try:
-            project_path = sanitize_path(project_path)
-        except SecurityError as e:
-            logger.warning("Invalid project path: %s", e)
-            raise
-        persist_path = os.path.join(os.path.abspath(project_path), config.database.default_persist_path)
-    elif persist_path is None:
-        persist_path = config.database.default_persist_path  # Fallback using config
+    persist_path = _resolve_persist_path(persist_path, project_path)
 
-    # Validate persist_path
     try:
-        persist_path = validate_persist_path(persist_path)
-    except SecurityError as e:
-        logger.warning("Invalid persist path: %s", e)
+        # Initialize database (client and collection are memoized per path)
+        collection, hits = _open_with_name_hits(query, persist_path, top_k)
+
+        # Functions named in the query fill top_k: no embedding or ANN needed
+        if hits and len(hits) >= top_k:
+            logger.debug("Exact name match for query: '%s'", query)
+            return _with_context(hits, depth)
+
+        # Embed the query (served from cache on repeats)
+        if query_embedding is None:
+            logger.debug("Embedding query...")
+            query_embedding = get_query_embedding(query, persist_path)
+
+        return _search_embedded(
+            query, query_embedding, collection, persist_path, top_k, depth, hits
+        )
+
+    except SecurityError:
         raise
+    except Exception as e:
+        logger.exception("Search error for query '%s'", query)
+        if depth > 0:
+            return {"results": [], "context": None}
+        return []
+
+
+async def asearch_code(
+    query: str,
+    persist_path: str = None,
+    top_k: int = None,
+    depth: int = None,
+    project_path: str = None,
+    executor=None
+):
+    """
+    Async variant of search_code that overlaps its blocking phases.
+
+    Opening the database and embedding the query run concurrently; the
+    vector search and context expansion then run on the executor, so the
+    event loop is never blocked. A query containing identifiers is looked
+    up by name first and only embedded if the name hits do not fill top_k.
+
+    Args:
+        query: Natural language search query
+        persist_path: Path to the ChromaDB persistence directory.
+                      If None and project_path provided, derives from project_path.
+        top_k: Number of results to return (uses config default if None)
+        depth: If > 0, return expanded context for the best match
+        project_path: Path to the indexed project (used to derive persist_path)
+        executor: Executor for blocking work (the loop's default if None)
+
+    Returns:
+        Same as search_code.
+
+    Raises:
+        InputValidationError: If query is invalid.
+        SecurityError: If paths are invalid.
+    """
+    config = get_config()
+
+    if top_k is None:
+        top_k = config.search.default_top_k
+    if depth is None:
+        depth = 0
 
     try:
-        # Initialize database
-        init_db(persist_path=persist_path)
+        query = validate_query(query)
+    except InputValidationError as e:
+        logger.warning("Invalid query: %s", e)
+        raise
 
-        # Embed the query
-        logger.debug("Embedding query...")
-        query_embedding = embed_query(query)
+    logger.debug("Searching for query: '%s' (top_k=%d, depth=%d)", query, top_k, depth)
 
-        # Search the database (returns formatted results)
-        results = db_search(query_embedding, top_k=top_k)
+    loop = asyncio.get_running_loop()
+    # abspath and path validation touch the filesystem; keep them off the loop
+    persist_path = await loop.run_in_executor(
+        executor, _resolve_persist_path, persist_path, project_path
+    )
+
+    # Start embedding while the collection is opened, unless the query may
+    # name functions directly and so may not need an embedding at all
+    embed_task = None
+    if not _identifier_tokens(query):
+        embed_task = asyncio.ensure_future(_query_batcher.embed(query, persist_path))
+    try:
+        collection, hits = await loop.run_in_executor(
+            executor, _open_with_name_hits, query, persist_path, top_k
+        )
 
-        # If depth > 0, return expanded context
-        if depth > 0:
-            context = None
-            if results:
-                best_match = results[0]
-                func_name = best_match["function_name"]
-                context = get_function_context(func_name, depth)
-            return {
-                "results": results,
-                "context": context
-            }
+        if hits and len(hits) >= top_k:
+            logger.debug("Exact name match for query: '%s'", query)
+            return await loop.run_in_executor(executor, _with_context, hits, depth)
 
-        return results
+        if embed_task is None:
+            embed_task = asyncio.ensure_future(_query_batcher.embed(query, persist_path))
+        query_embedding = await embed_task
+
+        return await loop.run_in_executor(
+            executor,
+            _search_embedded,
+            query, query_embedding, collection, persist_path, top_k, depth, hits,
+        )
 
     except SecurityError:
         raise
@@ -111,6 +785,50 @@ def search_code(
         if depth > 0:
             return {"results": [], "context": None}
         return []
+    finally:
+        if embed_task is not None and not embed_task.done():
+            embed_task.cancel()
+
+
+def _search_embedded(
+    query: str,
+    query_embedding,
+    collection,
+    persist_path: str,
+    top_k: int,
+    depth: int,
+    hits: list[dict] = None
+):
+    """
+    Run the vector search for an embedded query against an open database.
+
+    Shared by search_code and asearch_code; serves near-duplicate queries
+    from the semantic cache and expands context when depth > 0. Functions
+    named in the query (hits), if any, are ranked ahead of the semantic
+    matches, which fill the rest of top_k.
+    """
+    if hits:
+        results = list(hits)
+        seen = {(r["file_path"], r["function_name"], r["line_start"]) for r in results}
+        for r in db_search(query_embedding, top_k=top_k, collection=collection):
+            if (r["file_path"], r["function_name"], r["line_start"]) not in seen:
+                results.append(r)
+        return _with_context(results[:top_k], depth)
+
+    scope = (persist_path, top_k, depth, _index_version(persist_path))
+    cached = _semantic_cache.get(query_embedding, scope)
+    if cached is not None:
+        logger.debug("Semantic cache hit for query: '%s'", query)
+        return _copy_results(cached)
+
+    # Search the database (returns formatted results)
+    results = db_search(query_embedding, top_k=top_k, collection=collection)
+
+    # If depth > 0, return expanded context
+    results = _with_context(results, depth)
+
+    _semantic_cache.put(query_embedding, scope, results)
+    return _copy_results(results)
 
 
 def is_indexed(persist_path: str = None, project_path: str = None) -> bool:
@@ -125,33 +843,27 @@ def is_indexed(persist_path: str = None, project_path: str = None) -> bool:
     Returns:
         True if database exists and has items, False otherwise
     """
-    config = get_config()
-
     # Derive persist_path from project_path if not explicitly provided
-    if persist_path is None and project_path:
-        try:
-            project_path = sanitize_path(project_path)
-        except SecurityError:
-            logger.debug("Invalid project path in is_indexed")
-            return False
-        persist_path = os.path.join(os.path.abspath(project_path), config.database.default_persist_path)
-    elif persist_path is None:
-        persist_path = config.database.default_persist_path  # Fallback using config
-
-    # Validate persist_path
     try:
-        persist_path = validate_persist_path(persist_path)
+        persist_path = _resolve_persist_path(persist_path, project_path, logging.DEBUG)
     except SecurityError:
-        logger.debug("Invalid persist path in is_indexed")
         return False
 
     try:
         if not os.path.exists(persist_path):
             return False
 
-        init_db(persist_path=persist_path)
-        stats = get_stats()
-        return stats["total_functions"] > 0
+        # Unchanged database files mean an unchanged answer
+        version = _index_version(persist_path)
+        cached = _is_indexed_cache.get(persist_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        collection = init_db(persist_path=persist_path)
+        stats = get_stats(collection)
+        indexed = stats["total_functions"] > 0
+        _is_indexed_cache[persist_path] = (version, indexed)
+        return indexed
 
     except Exception:
         logger.debug("Exception checking index status for %s", persist_path)
@@ -163,7 +875,8 @@ def search_code_with_context(
     persist_path: str = None,
     top_k: int = None,
     depth: int = None,
-    project_path: str = None
+    project_path: str = None,
+    query_embedding: list[float] = None
 ) -> dict:
     """
     Search for code with expanded context (callers, callees, same-file functions).
@@ -175,6 +888,7 @@ def search_code_with_context(
         top_k: Number of results to return (uses config default if None)
         depth: How many hops of relationships to include (uses config default if None)
         project_path: Path to the indexed project (used to derive persist_path)
+        query_embedding: Precomputed embedding for the query; embedded if None
 
     Returns:
         Dict with "results" and "context" keys
@@ -187,7 +901,9 @@ def search_code_with_context(
     if depth is None:
         depth = config.search.default_depth
 
-    results = search_code(query, persist_path, top_k, project_path=project_path)
+    results = search_code(
+        query, persist_path, top_k, project_path=project_path, query_embedding=query_embedding
+    )
 
     context = None
     if results and depth > 0:
@@ -202,6 +918,72 @@ def search_code_with_context(
     }
 
 
+async def asearch_code_with_context(
+    query: str,
+    persist_path: str = None,
+    top_k: int = None,
+    depth: int = None,
+    project_path: str = None,
+    executor=None,
+    context_top_n: int = CONTEXT_EXPANSION_TOP_N
+) -> dict:
+    """
+    Async search with context expanded for each of the top matches.
+
+    Context for up to context_top_n results is fetched concurrently on the
+    executor and attached to each of those results under "context". Pass
+    context_top_n=1 when only the best match's context will be shown.
+
+    Args:
+        query: Natural language search query
+        persist_path: Path to the ChromaDB persistence directory.
+                      If None and project_path provided, derives from project_path.
+        top_k: Number of results to return (uses config default if None)
+        depth: How many hops of relationships to include (uses config default if None)
+        project_path: Path to the indexed project (used to derive persist_path)
+        executor: Executor for blocking work (the loop's default if None)
+        context_top_n: Number of top matches to expand context for
+
+    Returns:
+        Dict with "results" and "context" keys; "context" is the best match's
+    """
+    config = get_config()
+
+    if top_k is None:
+        top_k = config.search.default_top_k
+    if depth is None:
+        depth = config.search.default_depth
+
+    results = await asearch_code(
+        query, persist_path, top_k, project_path=project_path, executor=executor
+    )
+
+    if not results or depth <= 0:
+        return {"results": results, "context": None}
+
+    loop = asyncio.get_running_loop()
+    expanded = results[:max(1, context_top_n)]
+    try:
+        contexts = await asyncio.gather(*(
+            loop.run_in_executor(executor, get_function_context, r["function_name"], depth)
+            for r in expanded
+        ))
+    except Exception:
+        logger.exception("Context expansion failed for query '%s'", query)
+        return {"results": results, "context": None}
+
+    # Result dicts may be shared with the semantic cache; attach via copies
+    results = [
+        {**result, "context": context}
+        for result, context in zip(expanded, contexts)
+    ] + results[len(expanded):]
+
+    return {
+        "results": results,
+        "context": contexts[0]
+    }
+
+
 if __name__ == "__main__":
     if is_indexed():
         print("Database is indexed. Searching for 'palindrome'...\n")
@@ -215,7 +997,7 @@ if __name__ == "__main__":
                 print(f"File: {result['file_path']}")
                 print(f"Lines: {result['line_start']}-{result['line_end']}")
                 print(f"Summary: {result['summary']}")
-                print(f"Similarity: {result['similarity']}")
+                print(f"Similarity: {result.get('similarity', 'exact name match')}")
                 print(f"Code:\n{result['code']}")
                 print()
         else:
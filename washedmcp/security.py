@@ -11,11 +11,17 @@ Addresses security concerns:
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import os
 import re
+import stat
+import threading
 from pathlib import Path
 from typing import Optional, Tuple
 
+import numpy as np
+
 # Configuration constants
 MAX_FILE_SIZE_MB = 10  # Default max file size in megabytes
 MAX_QUERY_LENGTH = 1000  # Maximum query string length
@@ -30,21 +36,46 @@ DANGEROUS_PATTERNS = [
 
 # Sensitive file patterns that should not be indexed
 SENSITIVE_FILE_PATTERNS = [
-    r'\.env$',
-    r'\.env\.',
+    r'\.env(?:$|\.)',
     r'credentials',
     r'secrets?\.',
     r'private[_-]?key',
-    r'\.pem$',
-    r'\.key$',
-    r'\.p12$',
-    r'\.pfx$',
-    r'id_rsa',
-    r'id_dsa',
-    r'id_ecdsa',
-    r'id_ed25519',
+    r'\.(?:pem|key|p12|pfx)$',
+    r'id_(?:rsa|dsa|ecdsa|ed25519)',
 ]
 
+# str.translate table that deletes null bytes
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
+# Combined patterns, compiled once
+_DANGEROUS_RE = re.compile("|".join(DANGEROUS_PATTERNS))
+
+# SENSITIVE_FILE_PATTERNS are all literal, so filenames are screened with
+# C-level str.endswith / substring tests instead of a regex. Keep these in
+# sync with the patterns above.
+_SENSITIVE_SUFFIXES = ('.env', '.pem', '.key', '.p12', '.pfx')
+_SENSITIVE_SUBSTRINGS = (
+    '.env.',
+    'credentials',
+    'secret.',
+    'secrets.',
+    'private_key',
+    'private-key',
+    'privatekey',
+    'id_rsa',
+    'id_dsa',
+    'id_ecdsa',
+    'id_ed25519',
+)
+
+
+def _is_sensitive_filename(filename: str) -> bool:
+    """True if a file's basename matches SENSITIVE_FILE_PATTERNS (case-insensitive)."""
+    filename = filename.lower()
+    if filename.endswith(_SENSITIVE_SUFFIXES):
+        return True
+    return any(s in filename for s in _SENSITIVE_SUBSTRINGS)
+
 
 class SecurityError(Exception):
     """Base exception for security-related errors."""
@@ -92,6 +123,12 @@ def sanitize_path(path: str) -> str:
     Raises:
         InputValidationError: If the path is empty or invalid.
     """
+    _check_path_str(path)
+    return _sanitize_path_str(path)
+
+
+def _check_path_str(path: str) -> None:
+    """Run sanitize_path's input checks without normalizing."""
     if not path:
         raise InputValidationError("Path cannot be empty")
 
@@ -102,76 +139,215 @@ def sanitize_path(path: str) -> str:
     if '\x00' in path:
         raise InputValidationError("Path contains null bytes")
 
+
+@functools.lru_cache(maxsize=256)
+def _sanitize_path_str(path: str) -> str:
+    """Normalize a checked str path; pure on its input, so memoized."""
     # Normalize the path (handles redundant separators, etc.)
     cleaned = os.path.normpath(path)
 
     return cleaned
 
 
-def validate_path(path: str, base_dir: str) -> str:
+# Per-thread flag: True while the thread is inside path_cache_scope()
+_path_cache_state = threading.local()
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_realpath(abs_path: str) -> str:
     """
-    Validate that a path is within the allowed base directory.
+    os.path.realpath of an absolute path, memoized.
 
-    Resolves symlinks and ensures the final path is within base_dir.
-    Prevents path traversal attacks.
+    Used for base directories, which are resolved once per file checked but
+    rarely change. Only consulted inside path_cache_scope().
+    """
+    return os.path.realpath(abs_path)
 
-    Args:
-        path: The path to validate.
-        base_dir: The allowed base directory.
 
-    Returns:
-        The resolved absolute path if valid.
+def _base_realpath(abs_base: str) -> str:
+    """Realpath of a base directory, memoized only inside path_cache_scope()."""
+    if getattr(_path_cache_state, "active", False):
+        return _cached_realpath(abs_base)
+    return os.path.realpath(abs_base)
 
-    Raises:
-        PathTraversalError: If the path escapes the base directory.
-        SymlinkError: If a symlink points outside the base directory.
-        InputValidationError: If inputs are invalid.
+
+def _is_within(real_path: str, real_base: str) -> bool:
+    """
+    True if real_path is real_base or lies below it.
+
+    Compares in place instead of building real_base + os.sep, and still
+    rejects siblings sharing a prefix (e.g., /home/user vs /home/username).
+    """
+    base_len = len(real_base)
+    return real_path.startswith(real_base) and (
+        len(real_path) == base_len or real_path[base_len] == os.sep
+    )
+
+
+@functools.lru_cache(maxsize=65536)
+def _dir_chain_is_plain(directory: str, prefix_len: int) -> bool:
+    """
+    True if no directory from `directory` up to the base is a symlink.
+
+    prefix_len is the length of the base path plus its separator. Memoized
+    because sibling files share parents; only consulted inside
+    path_cache_scope().
+    """
+    if len(directory) < prefix_len:
+        return True
+    if stat.S_ISLNK(os.lstat(directory).st_mode):
+        return False
+    return _dir_chain_is_plain(os.path.dirname(directory), prefix_len)
+
+
+def clear_path_caches() -> None:
+    """
+    Forget memoized path resolutions.
+
+    path_cache_scope() calls this on entry and exit, so symlinks added or
+    removed since the last scan are seen.
+    """
+    _cached_realpath.cache_clear()
+    _dir_chain_is_plain.cache_clear()
+
+
+@contextlib.contextmanager
+def path_cache_scope():
+    """
+    Memoize path resolution for the duration of one directory scan.
+
+    Inside the scope, validate_path and is_safe_to_index remember which
+    directories are free of symlinks and skip os.path.realpath for files
+    under them. Outside it (e.g. one-off checks in a long-running server)
+    every path is fully resolved, so a directory later replaced by a
+    symlink is never trusted from a stale answer.
+    """
+    outer = getattr(_path_cache_state, "active", False)
+    if not outer:
+        clear_path_caches()
+    _path_cache_state.active = True
+    try:
+        yield
+    finally:
+        _path_cache_state.active = outer
+        if not outer:
+            clear_path_caches()
+
+
+def _resolve_under(
+    abs_path: str,
+    abs_base: str,
+    real_base: str,
+    is_link: Optional[bool] = None
+) -> Tuple[str, bool]:
     """
+    Resolve abs_path, skipping realpath when nothing below abs_base is a link.
+
+    Most indexed files sit under plain directories, so lstat-ing the file
+    (and, once per scan, its parent directories) is far cheaper than
+    realpath's walk from the root. Outside path_cache_scope(), and on any
+    symlink or lstat failure, falls back to os.path.realpath. Pass is_link
+    when the caller already knows it (e.g. from a DirEntry) to skip the
+    lstat of abs_path.
+
+    Returns:
+        Tuple of (real_path, is_link) where is_link says whether abs_path
+        itself is a symlink.
+    """
+    prefix = abs_base.rstrip(os.sep) + os.sep
+    if getattr(_path_cache_state, "active", False) and abs_path.startswith(prefix):
+        try:
+            if is_link is None:
+                is_link = stat.S_ISLNK(os.lstat(abs_path).st_mode)
+            if not is_link and _dir_chain_is_plain(os.path.dirname(abs_path), len(prefix)):
+                return real_base.rstrip(os.sep) + os.sep + abs_path[len(prefix):], False
+        except OSError:
+            is_link = False
+    elif is_link is None:
+        is_link = os.path.islink(abs_path)
+
+    return os.path.realpath(abs_path), is_link
+
+
+def _validate_path(
+    path: str,
+    base_dir: str,
+    is_link: Optional[bool] = None
+) -> Tuple[str, bool]:
+    """validate_path, also reporting whether the path itself is a symlink."""
     if not path:
         raise InputValidationError("Path cannot be empty")
 
     if not base_dir:
         raise InputValidationError("Base directory cannot be empty")
 
-    # Sanitize both paths first
-    path = sanitize_path(path)
+    # The base repeats across calls, so its memoized sanitization is cheap;
+    # the path is only checked here and normalized once below
     base_dir = sanitize_path(base_dir)
+    _check_path_str(path)
 
-    # Convert to absolute paths
-    abs_base = os.path.abspath(base_dir)
+    # Convert to absolute paths (sanitize_path already normalized the base,
+    # so an absolute base needs no abspath call)
+    abs_base = base_dir if os.path.isabs(base_dir) else os.path.abspath(base_dir)
 
     # If path is relative, join with base_dir
     if not os.path.isabs(path):
-        abs_path = os.path.abspath(os.path.join(abs_base, path))
+        abs_path = os.path.normpath(os.path.join(abs_base, path))
     else:
-        abs_path = os.path.abspath(path)
+        abs_path = os.path.normpath(path)
 
     # Resolve symlinks to get the real path
     try:
-        real_path = os.path.realpath(abs_path)
-        real_base = os.path.realpath(abs_base)
+        real_base = _base_realpath(abs_base)
+        real_path, is_link = _resolve_under(abs_path, abs_base, real_base, is_link)
     except (OSError, ValueError) as e:
         raise PathTraversalError(f"Cannot resolve path: {e}")
 
     # Ensure the resolved path is within the base directory
-    # Add trailing separator to avoid false positives
-    # e.g., /home/user vs /home/username
-    if not real_path.startswith(real_base + os.sep) and real_path != real_base:
+    if not _is_within(real_path, real_base):
         raise PathTraversalError(
             f"Path '{path}' resolves to '{real_path}' which is outside "
             f"the allowed directory '{real_base}'"
         )
 
-    return real_path
+    return real_path, is_link
 
 
-def validate_file_size(path: str, max_size_mb: float = MAX_FILE_SIZE_MB) -> bool:
+def validate_path(path: str, base_dir: str) -> str:
+    """
+    Validate that a path is within the allowed base directory.
+
+    Resolves symlinks and ensures the final path is within base_dir.
+    Prevents path traversal attacks.
+
+    Args:
+        path: The path to validate.
+        base_dir: The allowed base directory.
+
+    Returns:
+        The resolved absolute path if valid.
+
+    Raises:
+        PathTraversalError: If the path escapes the base directory.
+        SymlinkError: If a symlink points outside the base directory.
+        InputValidationError: If inputs are invalid.
+    """
+    return _validate_path(path, base_dir)[0]
+
+
+def validate_file_size(
+    path: str,
+    max_size_mb: float = MAX_FILE_SIZE_MB,
+    precomputed_stat: Optional[os.stat_result] = None
+) -> bool:
     """
     Check if a file is within the allowed size limit.
 
     Args:
         path: Path to the file to check.
         max_size_mb: Maximum allowed file size in megabytes.
+        precomputed_stat: os.stat result the caller already holds for path;
+                          saves re-statting the file.
 
     Returns:
         True if file is within size limit.
@@ -186,26 +362,34 @@ def validate_file_size(path: str, max_size_mb: float = MAX_FILE_SIZE_MB) -> bool
     if max_size_mb <= 0:
         raise InputValidationError("Max size must be positive")
 
-    if not os.path.exists(path):
-        raise InputValidationError(f"File does not exist: {path}")
+    # A single stat answers existence, type and size without the races
+    # between separate exists/isfile/getsize calls
+    st = precomputed_stat
+    if st is None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise InputValidationError(f"File does not exist: {path}")
+        except OSError as e:
+            raise InputValidationError(f"Cannot read file size: {e}")
 
-    if not os.path.isfile(path):
+    if not stat.S_ISREG(st.st_mode):
         raise InputValidationError(f"Path is not a file: {path}")
 
-    try:
-        file_size = os.path.getsize(path)
-        max_size_bytes = max_size_mb * 1024 * 1024
+    return _check_size(path, st.st_size, max_size_mb)
 
-        if file_size > max_size_bytes:
-            raise FileSizeError(
-                f"File '{path}' is {file_size / (1024*1024):.2f}MB, "
-                f"exceeds limit of {max_size_mb}MB"
-            )
 
-        return True
+def _check_size(path: str, file_size: int, max_size_mb: float) -> bool:
+    """Raise FileSizeError if file_size exceeds max_size_mb."""
+    max_size_bytes = max_size_mb * 1024 * 1024
+
+    if file_size > max_size_bytes:
+        raise FileSizeError(
+            f"File '{path}' is {file_size / (1024*1024):.2f}MB, "
+            f"exceeds limit of {max_size_mb}MB"
+        )
 
-    except OSError as e:
-        raise InputValidationError(f"Cannot read file size: {e}")
+    return True
 
 
 def is_symlink_safe(path: str, base_dir: str) -> bool:
@@ -225,9 +409,9 @@ def is_symlink_safe(path: str, base_dir: str) -> bool:
 
     try:
         real_path = os.path.realpath(path)
-        real_base = os.path.realpath(base_dir)
+        real_base = _base_realpath(os.path.abspath(base_dir))
 
-        return real_path.startswith(real_base + os.sep) or real_path == real_base
+        return _is_within(real_path, real_base)
     except (OSError, ValueError):
         return False
 
@@ -256,27 +440,71 @@ def is_safe_to_index(
     Returns:
         Tuple of (is_safe, reason). If not safe, reason contains the explanation.
     """
+    return _is_safe_to_index(path, base_dir, max_size_mb, check_sensitive)
+
+
+def is_safe_to_index_entry(
+    entry: os.DirEntry,
+    base_dir: str,
+    max_size_mb: float = MAX_FILE_SIZE_MB,
+    check_sensitive: bool = True
+) -> Tuple[bool, Optional[str]]:
+    """
+    is_safe_to_index for a file found with os.scandir.
+
+    Uses the DirEntry's cached type and stat information, saving the lstat
+    and stat that is_safe_to_index would otherwise make per file.
+
+    Args:
+        entry: Directory entry for the file to check.
+        base_dir: The allowed base directory.
+        max_size_mb: Maximum allowed file size in megabytes.
+        check_sensitive: Whether to check for sensitive file patterns.
+
+    Returns:
+        Tuple of (is_safe, reason). If not safe, reason contains the explanation.
+    """
+    return _is_safe_to_index(entry.path, base_dir, max_size_mb, check_sensitive, entry)
+
+
+def _is_safe_to_index(
+    path: str,
+    base_dir: str,
+    max_size_mb: float,
+    check_sensitive: bool,
+    entry: Optional[os.DirEntry] = None
+) -> Tuple[bool, Optional[str]]:
+    """Shared body of is_safe_to_index and is_safe_to_index_entry."""
     try:
         # Validate path is within base directory
-        validated_path = validate_path(path, base_dir)
+        known_link = entry.is_symlink() if entry is not None else None
+        validated_path, is_link = _validate_path(path, base_dir, known_link)
+
+        # One stat serves both the file-type and size checks; the validated
+        # path is already resolved, so this is the target's stat
+        try:
+            if entry is not None and not is_link:
+                st = entry.stat(follow_symlinks=False)
+            else:
+                st = os.stat(validated_path)
+        except OSError:
+            return False, f"Not a file: {path}"
 
         # Check if it's a file (not directory)
-        if not os.path.isfile(validated_path):
+        if not stat.S_ISREG(st.st_mode):
             return False, f"Not a file: {path}"
 
         # Check symlink safety
-        if os.path.islink(path) and not is_symlink_safe(path, base_dir):
+        if is_link and not is_symlink_safe(path, base_dir):
             return False, f"Symlink points outside base directory: {path}"
 
         # Check file size
-        validate_file_size(validated_path, max_size_mb)
+        validate_file_size(validated_path, max_size_mb, precomputed_stat=st)
 
         # Check for sensitive files
         if check_sensitive:
-            filename = os.path.basename(validated_path).lower()
-            for pattern in SENSITIVE_FILE_PATTERNS:
-                if re.search(pattern, filename, re.IGNORECASE):
-                    return False, f"Sensitive file detected: {path}"
+            if _is_sensitive_filename(os.path.basename(validated_path)):
+                return False, f"Sensitive file detected: {path}"
 
         return True, None
 
@@ -312,6 +540,12 @@ def validate_query(query: str, max_length: int = MAX_QUERY_LENGTH) -> str:
     if not isinstance(query, str):
         raise InputValidationError(f"Query must be a string, got {type(query).__name__}")
 
+    return _validate_query_str(query, max_length)
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_query_str(query: str, max_length: int) -> str:
+    """Validate a str query; pure on its inputs, so memoized."""
     # Strip whitespace
     query = query.strip()
 
@@ -331,6 +565,31 @@ def validate_query(query: str, max_length: int = MAX_QUERY_LENGTH) -> str:
     return query
 
 
+# numpy dtype kinds accepted as embedding values (bool, int, uint, float),
+# matching the int/float elements the list validator accepts
+_NUMERIC_DTYPE_KINDS = "biuf"
+
+
+def _as_numeric_array(values) -> Optional[np.ndarray]:
+    """Convert values to a bool/int/float array, or None if they are not all numeric."""
+    try:
+        arr = np.asarray(values)
+    except (ValueError, TypeError):
+        return None
+    return arr if arr.dtype.kind in _NUMERIC_DTYPE_KINDS else None
+
+
+def _check_finite(arr: np.ndarray) -> None:
+    """Raise on the first NaN or Inf in a 1-D numeric array."""
+    if arr.dtype.kind != "f" or np.isfinite(arr).all():
+        return
+
+    i = int(np.flatnonzero(~np.isfinite(arr))[0])
+    if np.isnan(arr[i]):
+        raise EmbeddingValidationError(f"Embedding contains NaN at index {i}")
+    raise EmbeddingValidationError(f"Embedding contains Inf at index {i}")
+
+
 def validate_embedding(
     embedding: list,
     expected_dim: int = EXPECTED_EMBEDDING_DIM
@@ -339,7 +598,8 @@ def validate_embedding(
     Validate that an embedding has the correct dimensions and format.
 
     Args:
-        embedding: The embedding vector to validate.
+        embedding: The embedding vector to validate: a list, tuple or
+                   1-D numpy array (checked without conversion).
         expected_dim: Expected number of dimensions.
 
     Returns:
@@ -351,9 +611,21 @@ def validate_embedding(
     if embedding is None:
         raise EmbeddingValidationError("Embedding cannot be None")
 
+    if isinstance(embedding, np.ndarray):
+        if embedding.shape != (expected_dim,):
+            raise EmbeddingValidationError(
+                f"Embedding has shape {embedding.shape}, expected ({expected_dim},)"
+            )
+        if embedding.dtype.kind not in _NUMERIC_DTYPE_KINDS:
+            raise EmbeddingValidationError(
+                f"Embedding dtype is not numeric: {embedding.dtype}"
+            )
+        _check_finite(embedding)
+        return True
+
     if not isinstance(embedding, (list, tuple)):
         raise EmbeddingValidationError(
-            f"Embedding must be a list or tuple, got {type(embedding).__name__}"
+            f"Embedding must be a list, tuple or numpy array, got {type(embedding).__name__}"
         )
 
     if len(embedding) != expected_dim:
@@ -361,7 +633,13 @@ def validate_embedding(
             f"Embedding has {len(embedding)} dimensions, expected {expected_dim}"
         )
 
-    # Validate all elements are numeric
+    # Fast path: a flat numeric list converts to one array checked in C
+    arr = _as_numeric_array(embedding)
+    if arr is not None and arr.ndim == 1:
+        _check_finite(arr)
+        return True
+
+    # Slow path: find and report the offending element
     for i, val in enumerate(embedding):
         if not isinstance(val, (int, float)):
             raise EmbeddingValidationError(
@@ -384,7 +662,8 @@ def validate_embedding(
 
 def validate_embeddings_batch(
     embeddings: list,
-    expected_dim: int = EXPECTED_EMBEDDING_DIM
+    expected_dim: int = EXPECTED_EMBEDDING_DIM,
+    accept_ndarray: bool = True
 ) -> bool:
     """
     Validate a batch of embeddings.
@@ -392,6 +671,8 @@ def validate_embeddings_batch(
     Args:
         embeddings: List of embedding vectors.
         expected_dim: Expected number of dimensions per embedding.
+        accept_ndarray: Also accept a 2D numpy array (or a list of 1D arrays),
+                        validated without converting to lists.
 
     Returns:
         True if all embeddings are valid.
@@ -402,6 +683,11 @@ def validate_embeddings_batch(
     if embeddings is None:
         raise EmbeddingValidationError("Embeddings batch cannot be None")
 
+    if accept_ndarray and isinstance(embeddings, np.ndarray):
+        if embeddings.ndim >= 1 and embeddings.shape[0] == 0:
+            raise EmbeddingValidationError("Embeddings batch cannot be empty")
+        return validate_embedding_matrix(embeddings, expected_dim=expected_dim)
+
     if not isinstance(embeddings, list):
         raise EmbeddingValidationError(
             f"Embeddings must be a list, got {type(embeddings).__name__}"
@@ -410,6 +696,23 @@ def validate_embeddings_batch(
     if not embeddings:
         raise EmbeddingValidationError("Embeddings batch cannot be empty")
 
+    # Fast path: a well-formed batch stacks into one (n, dim) array, so the
+    # type, dimension and finiteness checks are a single pass in C
+    row_types = (list, tuple, np.ndarray) if accept_ndarray else (list, tuple)
+    if all(isinstance(e, row_types) for e in embeddings):
+        matrix = _as_numeric_array(embeddings)
+        if matrix is not None and matrix.ndim == 2 and matrix.shape[1] == expected_dim:
+            if matrix.dtype.kind == "f" and not np.isfinite(matrix).all():
+                i = int(np.argwhere(~np.isfinite(matrix))[0][0])
+                try:
+                    _check_finite(matrix[i])
+                except EmbeddingValidationError as e:
+                    raise EmbeddingValidationError(
+                        f"Invalid embedding at index {i}: {e}"
+                    )
+            return True
+
+    # Slow path: validate row by row to report the first bad embedding
     for i, embedding in enumerate(embeddings):
         try:
             validate_embedding(embedding, expected_dim)
@@ -421,6 +724,56 @@ def validate_embeddings_batch(
     return True
 
 
+def validate_embedding_matrix(
+    embeddings: np.ndarray,
+    expected_rows: Optional[int] = None,
+    expected_dim: int = EXPECTED_EMBEDDING_DIM
+) -> bool:
+    """
+    Validate a 2D array of embeddings in a single vectorized pass.
+
+    Args:
+        embeddings: Array of shape (n, expected_dim), one embedding per row.
+        expected_rows: Expected number of rows, or None to accept any count.
+        expected_dim: Expected number of dimensions per embedding.
+
+    Returns:
+        True if all embeddings are valid.
+
+    Raises:
+        EmbeddingValidationError: If the array has the wrong shape, is not
+            of a numeric dtype, or contains NaN/Inf values.
+    """
+    if not isinstance(embeddings, np.ndarray):
+        raise EmbeddingValidationError(
+            f"Embeddings must be a numpy array, got {type(embeddings).__name__}"
+        )
+
+    if embeddings.ndim != 2 or embeddings.shape[1] != expected_dim:
+        raise EmbeddingValidationError(
+            f"Embeddings have shape {embeddings.shape}, expected (n, {expected_dim})"
+        )
+
+    if expected_rows is not None and embeddings.shape[0] != expected_rows:
+        raise EmbeddingValidationError(
+            f"Got {embeddings.shape[0]} embeddings, expected {expected_rows}"
+        )
+
+    # np.isfinite raises TypeError on object or string arrays
+    if embeddings.dtype.kind not in _NUMERIC_DTYPE_KINDS:
+        raise EmbeddingValidationError(
+            f"Embeddings dtype is not numeric: {embeddings.dtype}"
+        )
+
+    if not np.isfinite(embeddings).all():
+        row, col = np.argwhere(~np.isfinite(embeddings))[0]
+        raise EmbeddingValidationError(
+            f"Invalid embedding at index {row}: contains NaN or Inf at index {col}"
+        )
+
+    return True
+
+
 def validate_persist_path(persist_path: str) -> str:
     """
     Validate a persistence path for the database.
@@ -444,14 +797,13 @@ def validate_persist_path(persist_path: str) -> str:
     cleaned = sanitize_path(persist_path)
 
     # Check for dangerous patterns in the original path
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, persist_path):
-            raise PathTraversalError(
-                f"Persist path contains dangerous pattern: {persist_path}"
-            )
+    if _DANGEROUS_RE.search(persist_path):
+        raise PathTraversalError(
+            f"Persist path contains dangerous pattern: {persist_path}"
+        )
 
-    # Convert to absolute path
-    abs_path = os.path.abspath(cleaned)
+    # Convert to absolute path (cleaned is already normalized)
+    abs_path = cleaned if os.path.isabs(cleaned) else os.path.abspath(cleaned)
 
     # Ensure parent directory exists or can be created
     parent_dir = os.path.dirname(abs_path)
@@ -486,8 +838,9 @@ def sanitize_for_prompt(text: str, max_length: int = 10000) -> str:
     if len(text) > max_length:
         text = text[:max_length] + "... [truncated]"
 
-    # Remove null bytes
-    text = text.replace('\x00', '')
+    # Remove null bytes; the membership test skips the copy when there are none
+    if '\x00' in text:
+        text = text.translate(_NULL_TABLE)
 
     return text
 
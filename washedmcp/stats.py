@@ -5,14 +5,25 @@ Tracks cumulative token savings from using TOON format vs JSON across all search
 Stats are persisted to disk and accumulate over time.
 """
 
+import atexit
+import contextlib
 import json
 import os
+import tempfile
+import threading
 import time
-from dataclasses import dataclass, asdict
+import weakref
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -20,10 +31,21 @@ logger = get_logger(__name__)
 # Default stats file location
 DEFAULT_STATS_PATH = Path.home() / ".washedmcp" / "stats.json"
 
+# Recorded searches are written to disk in batches: after this many
+# unsaved searches, or once this many seconds have passed since the last
+# write, whichever comes first (and at interpreter exit)
+STATS_FLUSH_EVERY = 32
+STATS_FLUSH_INTERVAL_SECONDS = 5.0
+
 
-@dataclass
+@dataclass(slots=True)
 class TokenStats:
-    """Cumulative token savings statistics."""
+    """
+    Cumulative token savings statistics.
+
+    Fields must stay flat scalars (no nested dataclasses or containers):
+    _stats_dict() copies them shallowly.
+    """
 
     # Lifetime totals
     total_searches: int = 0
@@ -49,34 +71,119 @@ class TokenStats:
     session_tokens_saved_est: int = 0
 
 
+_STATS_FIELDS = tuple(f.name for f in fields(TokenStats))
+_STATS_DEFAULTS = {f.name: f.default for f in fields(TokenStats)}
+
+
+def _stats_dict(stats: TokenStats) -> dict:
+    """Shallow dict copy of the stats, without asdict()'s recursive deepcopy."""
+    return {name: getattr(stats, name) for name in _STATS_FIELDS}
+
+
+def _durable_writes() -> bool:
+    """Whether stats writes should be fsynced (WASHEDMCP_STATS_DURABLE)."""
+    return os.getenv("WASHEDMCP_STATS_DURABLE", "").lower() in ("true", "1", "yes")
+
+
+def _persisted_key(stats: TokenStats) -> tuple:
+    """Fields that change whenever the lifetime stats on disk would."""
+    return (
+        stats.total_searches,
+        stats.total_json_chars,
+        stats.total_toon_chars,
+        stats.first_search_at,
+        stats.last_search_at,
+    )
+
+
+# Trackers whose unsaved searches are written at interpreter exit; weak,
+# so registering does not keep a tracker alive
+_live_trackers: "weakref.WeakSet[StatsTracker]" = weakref.WeakSet()
+
+
+def _flush_live_trackers() -> None:
+    """atexit hook: flush every tracker that is still alive."""
+    for tracker in list(_live_trackers):
+        tracker.flush()
+
+
+atexit.register(_flush_live_trackers)
+
+
 class StatsTracker:
     """Tracks and persists token savings statistics."""
 
     def __init__(self, stats_path: Optional[Path] = None):
         self.stats_path = stats_path or DEFAULT_STATS_PATH
+        self._saved_key: Optional[tuple] = None  # _persisted_key of the file on disk
         self.stats = self._load_stats()
+        self._lock = threading.Lock()
+        self._summary: Optional[str] = None  # get_summary() text, until stats change
+        self._unsaved_searches = 0
+        self._last_flush = time.monotonic()
+        # Timestamp text for the current wall-clock second, reused by
+        # every search recorded within that second
+        self._ts_second = -1
+        self._ts_text = ""
+        _live_trackers.add(self)
 
     def _load_stats(self) -> TokenStats:
         """Load stats from disk or create new."""
         if self.stats_path.exists():
             try:
-                with open(self.stats_path, "r") as f:
-                    data = json.load(f)
-                    # Reset session stats on load
-                    data["session_searches"] = 0
-                    data["session_chars_saved"] = 0
-                    data["session_tokens_saved_est"] = 0
-                    return TokenStats(**data)
+                if HAS_ORJSON:
+                    data = orjson.loads(self.stats_path.read_bytes())
+                else:
+                    with open(self.stats_path, "r") as f:
+                        data = json.load(f)
+                # Reset session stats on load
+                data["session_searches"] = 0
+                data["session_chars_saved"] = 0
+                data["session_tokens_saved_est"] = 0
+                # Positional construction in field order; unknown keys in
+                # the file are ignored and missing ones take their defaults
+                stats = TokenStats(*[data.get(name, _STATS_DEFAULTS[name]) for name in _STATS_FIELDS])
+                self._saved_key = _persisted_key(stats)
+                return stats
             except (json.JSONDecodeError, TypeError) as e:
                 logger.warning(f"Failed to load stats, starting fresh: {e}")
         return TokenStats()
 
     def _save_stats(self):
-        """Persist stats to disk."""
+        """
+        Persist stats to disk (via orjson when installed), unless unchanged.
+
+        The file is written to a uniquely named temporary sibling and renamed
+        over stats.json, so a crash mid-write never leaves it truncated and
+        processes sharing the stats directory never write the same temp
+        file. Set WASHEDMCP_STATS_DURABLE=1 to also fsync before the rename.
+        """
+        key = _persisted_key(self.stats)
+        if key == self._saved_key:
+            return
+
         try:
             self.stats_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.stats_path, "w") as f:
-                json.dump(asdict(self.stats), f, indent=2)
+            if HAS_ORJSON:
+                # orjson serializes dataclasses natively, no asdict() copy
+                data = orjson.dumps(self.stats, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(_stats_dict(self.stats), indent=2).encode("utf-8")
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.stats_path.parent, prefix=".stats-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    if _durable_writes():
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, self.stats_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+            self._saved_key = key
         except Exception as e:
             logger.warning(f"Failed to save stats: {e}")
 
@@ -93,50 +200,96 @@ class StatsTracker:
         chars_saved = json_chars - toon_chars
 
         # Estimate tokens (rough approximation: 1 token ≈ 4 chars)
-        json_tokens = json_chars // 4
-        toon_tokens = toon_chars // 4
+        json_tokens = json_chars >> 2
+        toon_tokens = toon_chars >> 2
         tokens_saved = json_tokens - toon_tokens
 
-        # Update lifetime totals
-        self.stats.total_searches += 1
-        self.stats.total_json_chars += json_chars
-        self.stats.total_toon_chars += toon_chars
-        self.stats.total_chars_saved += chars_saved
-        self.stats.total_json_tokens_est += json_tokens
-        self.stats.total_toon_tokens_est += toon_tokens
-        self.stats.total_tokens_saved_est += tokens_saved
-
-        # Calculate average savings percentage
-        if self.stats.total_json_chars > 0:
-            self.stats.avg_savings_percent = round(
-                (self.stats.total_chars_saved / self.stats.total_json_chars) * 100, 2
-            )
-
-        # Update timestamps
-        now = datetime.now().isoformat()
-        if not self.stats.first_search_at:
-            self.stats.first_search_at = now
-        self.stats.last_search_at = now
-
-        # Update session stats
-        self.stats.session_searches += 1
-        self.stats.session_chars_saved += chars_saved
-        self.stats.session_tokens_saved_est += tokens_saved
-
-        # Persist
-        self._save_stats()
+        # Concurrent searches record from worker threads; update under the lock
+        with self._lock:
+            s = self.stats
+
+            # Update lifetime totals
+            s.total_searches += 1
+            s.total_json_chars += json_chars
+            s.total_toon_chars += toon_chars
+            s.total_chars_saved += chars_saved
+            s.total_json_tokens_est += json_tokens
+            s.total_toon_tokens_est += toon_tokens
+            s.total_tokens_saved_est += tokens_saved
+
+            # Calculate average savings percentage
+            if s.total_json_chars > 0:
+                s.avg_savings_percent = round(
+                    (s.total_chars_saved / s.total_json_chars) * 100, 2
+                )
+
+            # Update timestamps
+            now = self._timestamp()
+            if not s.first_search_at:
+                s.first_search_at = now
+            s.last_search_at = now
+
+            # Update session stats
+            s.session_searches += 1
+            s.session_chars_saved += chars_saved
+            s.session_tokens_saved_est += tokens_saved
+            lifetime_tokens_saved = s.total_tokens_saved_est
+
+            self._summary = None
+
+            # Persist in batches rather than rewriting the file per search
+            self._unsaved_searches += 1
+            if (
+                self._unsaved_searches >= STATS_FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= STATS_FLUSH_INTERVAL_SECONDS
+            ):
+                self._flush_locked()
 
         logger.debug(
             f"Search recorded: {chars_saved} chars saved ({tokens_saved} tokens est.), "
-            f"lifetime total: {self.stats.total_tokens_saved_est} tokens"
+            f"lifetime total: {lifetime_tokens_saved} tokens"
         )
 
+    def _timestamp(self) -> str:
+        """Local ISO timestamp at second precision, formatted once per second."""
+        second = int(time.time())
+        if second != self._ts_second:
+            self._ts_text = datetime.fromtimestamp(second).isoformat()
+            self._ts_second = second
+        return self._ts_text
+
+    def flush(self):
+        """Write any searches recorded since the last save to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """flush(); must be called with _lock held."""
+        if self._unsaved_searches:
+            self._save_stats()
+        self._unsaved_searches = 0
+        self._last_flush = time.monotonic()
+
     def get_stats(self) -> TokenStats:
-        """Get current statistics."""
-        return self.stats
+        """
+        Get current statistics.
+
+        Returns a copy taken under the lock, so a search being recorded on
+        another thread is never seen half-applied.
+        """
+        with self._lock:
+            return replace(self.stats)
 
     def get_summary(self) -> str:
         """Get a human-readable summary of token savings."""
+        with self._lock:
+            self._flush_locked()
+            if self._summary is None:
+                self._summary = self._build_summary()
+            return self._summary
+
+    def _build_summary(self) -> str:
+        """Render the summary text for the current stats."""
         s = self.stats
 
         if s.total_searches == 0:
@@ -175,20 +328,26 @@ class StatsTracker:
 
     def reset(self):
         """Reset all statistics."""
-        self.stats = TokenStats()
-        self._save_stats()
+        with self._lock:
+            self.stats = TokenStats()
+            self._save_stats()
+            self._unsaved_searches = 0
+            self._summary = None
         logger.info("Statistics reset")
 
 
 # Global tracker instance
 _tracker: Optional[StatsTracker] = None
+_tracker_lock = threading.Lock()
 
 
 def get_tracker() -> StatsTracker:
     """Get the global stats tracker instance."""
     global _tracker
     if _tracker is None:
-        _tracker = StatsTracker()
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = StatsTracker()
     return _tracker
 
 
@@ -204,7 +363,7 @@ def get_token_savings_summary() -> str:
 
 def get_token_stats() -> dict:
     """Get token statistics as a dictionary."""
-    return asdict(get_tracker().get_stats())
+    return _stats_dict(get_tracker().get_stats())
 
 
 def reset_stats():
@@ -213,21 +372,33 @@ def reset_stats():
 
 
 # CLI support
-def main():
-    """CLI entry point for viewing stats."""
-    import argparse
+_parser = None
+
 
-    parser = argparse.ArgumentParser(description="WashedMCP Token Savings Statistics")
-    parser.add_argument("--reset", action="store_true", help="Reset all statistics")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
+def _get_parser():
+    """Get the CLI argument parser, building it on first use."""
+    global _parser
+    if _parser is None:
+        import argparse
 
-    args = parser.parse_args()
+        _parser = argparse.ArgumentParser(description="WashedMCP Token Savings Statistics")
+        _parser.add_argument("--reset", action="store_true", help="Reset all statistics")
+        _parser.add_argument("--json", action="store_true", help="Output as JSON")
+    return _parser
+
+
+def main():
+    """CLI entry point for viewing stats."""
+    args = _get_parser().parse_args()
 
     if args.reset:
         reset_stats()
         print("Statistics reset.")
     elif args.json:
-        print(json.dumps(get_token_stats(), indent=2))
+        if HAS_ORJSON:
+            print(orjson.dumps(get_token_stats(), option=orjson.OPT_INDENT_2).decode("utf-8"))
+        else:
+            print(json.dumps(get_token_stats(), indent=2))
     else:
         print(get_token_savings_summary())
 
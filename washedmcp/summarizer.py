@@ -1,8 +1,17 @@
 """Claude Haiku based code summarizer that generates 1-line descriptions of functions."""
 
+import asyncio
+import hashlib
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
 from dotenv import load_dotenv
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
 from .config import get_config
 from .logging_config import get_logger
@@ -12,23 +21,156 @@ logger = get_logger(__name__)
 # Load environment variables from .env file
 load_dotenv()
 
+# Maximum summarization requests in flight at once
+SUMMARIZE_CONCURRENCY = 8
+
+# Summaries already paid for, keyed by a hash of (model, prompt, max
+# summary length, code):
+# an in-memory LRU in front of a SQLite file shared across runs
+SUMMARY_CACHE_PATH = Path.home() / ".washedmcp" / "summaries.sqlite"
+SUMMARY_MEMORY_CACHE_SIZE = 4096
+
+_summary_memory: "OrderedDict[str, str]" = OrderedDict()
+_summary_conn: Optional[sqlite3.Connection] = None
+_summary_cache_lock = threading.Lock()
+
 # Lazy client initialization
 _client = None
+_async_client = None
+
+
+def _get_api_key() -> str:
+    """Return the Anthropic API key, or raise if it is not set."""
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        logger.error("ANTHROPIC_API_KEY environment variable is not set")
+        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+    return api_key
 
 
 def _get_client() -> Anthropic:
     """Get or create the Anthropic client lazily."""
     global _client
     if _client is None:
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            logger.error("ANTHROPIC_API_KEY environment variable is not set")
-            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+        api_key = _get_api_key()
         logger.debug("Initializing Anthropic client")
         _client = Anthropic(api_key=api_key)
     return _client
 
 
+def _get_async_client() -> AsyncAnthropic:
+    """Get or create the async Anthropic client lazily."""
+    global _async_client
+    if _async_client is None:
+        api_key = _get_api_key()
+        logger.debug("Initializing async Anthropic client")
+        _async_client = AsyncAnthropic(api_key=api_key)
+    return _async_client
+
+
+def _summary_key(code: str, config) -> str:
+    """Cache key for a summary; changes with the model, prompt or length limit."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (
+        config.summarizer.model,
+        config.summarizer.prompt_template,
+        str(config.summarizer.max_summary_length),
+        code,
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _load_summary_cache() -> sqlite3.Connection:
+    """
+    Open (or reuse) the on-disk summary cache.
+
+    Must be called with _summary_cache_lock held.
+    """
+    global _summary_conn
+    if _summary_conn is None:
+        SUMMARY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(SUMMARY_CACHE_PATH), check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries (hash TEXT PRIMARY KEY, summary TEXT)"
+        )
+        conn.commit()
+        _summary_conn = conn
+    return _summary_conn
+
+
+def _remember(key: str, summary: str) -> None:
+    """Insert into the in-memory LRU; must be called with _summary_cache_lock held."""
+    _summary_memory[key] = summary
+    _summary_memory.move_to_end(key)
+    if len(_summary_memory) > SUMMARY_MEMORY_CACHE_SIZE:
+        _summary_memory.popitem(last=False)
+
+
+def _read_cached_summary(key: str) -> Optional[str]:
+    """Return a cached summary, or None on a miss."""
+    with _summary_cache_lock:
+        summary = _summary_memory.get(key)
+        if summary is not None:
+            _summary_memory.move_to_end(key)
+            return summary
+        try:
+            row = _load_summary_cache().execute(
+                "SELECT summary FROM summaries WHERE hash = ?", (key,)
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("Summary cache lookup failed: %s", e)
+            return None
+        if row is not None:
+            _remember(key, row[0])
+            return row[0]
+    return None
+
+
+def _write_cached_summary(key: str, summary: str) -> None:
+    """Store a summary in both cache tiers, ignoring cache errors."""
+    with _summary_cache_lock:
+        _remember(key, summary)
+        try:
+            conn = _load_summary_cache()
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (hash, summary) VALUES (?, ?)",
+                (key, summary),
+            )
+            conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("Summary cache store failed: %s", e)
+
+
+def _message_request(code: str, config) -> dict:
+    """Build the messages.create arguments for summarizing code."""
+    # Use config for model and settings
+    prompt = config.summarizer.prompt_template.format(code=code)
+    return {
+        "model": config.summarizer.model,
+        "max_tokens": config.summarizer.max_tokens,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+    }
+
+
+def _summary_text(message, config) -> str:
+    """Extract the one-line summary from an API response."""
+    summary = message.content[0].text.strip()
+
+    # Truncate to max length if needed
+    max_length = config.summarizer.max_summary_length
+    if len(summary) > max_length:
+        summary = summary[:max_length - 3] + "..."
+
+    return summary
+
+
 def summarize_function(code: str, function_name: str = None) -> str:
     """
     Summarize a single function's purpose in one line.
@@ -38,32 +180,53 @@ def summarize_function(code: str, function_name: str = None) -> str:
         function_name: Optional name of the function (not used in prompt but available for context)
 
     Returns:
-        A 1-line summary (max configured chars) of what the function does
+        A 1-line summary (max configured chars) of what the function does.
+        Code summarized before with the same model and prompt is served from
+        the summary cache; fallback messages are never cached.
     """
     config = get_config()
 
+    key = _summary_key(code, config)
+    cached = _read_cached_summary(key)
+    if cached is not None:
+        return cached
+
     try:
-        # Use config for model and settings
-        prompt = config.summarizer.prompt_template.format(code=code)
-
-        message = _get_client().messages.create(
-            model=config.summarizer.model,
-            max_tokens=config.summarizer.max_tokens,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+        message = _get_client().messages.create(**_message_request(code, config))
+        summary = _summary_text(message, config)
+        _write_cached_summary(key, summary)
+        return summary
+
+    except Exception:
+        logger.exception("Failed to summarize function")
+        return config.summarizer.fallback_message
+
+
+async def summarize_function_async(code: str, function_name: str = None) -> str:
+    """
+    Async variant of summarize_function using the async Anthropic client.
 
-        summary = message.content[0].text.strip()
+    Args:
+        code: The function source code to summarize
+        function_name: Optional name of the function
+
+    Returns:
+        A 1-line summary (max configured chars) of what the function does
+
+    The summary cache is SQLite-backed, so its reads and writes run in a
+    worker thread rather than on the event loop.
+    """
+    config = get_config()
 
-        # Truncate to max length if needed
-        max_length = config.summarizer.max_summary_length
-        if len(summary) > max_length:
-            summary = summary[:max_length - 3] + "..."
+    key = _summary_key(code, config)
+    cached = await asyncio.to_thread(_read_cached_summary, key)
+    if cached is not None:
+        return cached
 
+    try:
+        message = await _get_async_client().messages.create(**_message_request(code, config))
+        summary = _summary_text(message, config)
+        await asyncio.to_thread(_write_cached_summary, key, summary)
         return summary
 
     except Exception:
@@ -71,27 +234,61 @@ def summarize_function(code: str, function_name: str = None) -> str:
         return config.summarizer.fallback_message
 
 
-def summarize_batch(functions: list[dict]) -> list[str]:
+def summarize_batch(
+    functions: list[dict],
+    concurrency: int = SUMMARIZE_CONCURRENCY
+) -> list[str]:
     """
     Summarize multiple functions.
 
+    Up to `concurrency` API requests are in flight at once, so a batch
+    takes roughly len(functions) / concurrency round trips.
+
     Args:
         functions: List of dictionaries with "code" and optional "name" keys
+        concurrency: Maximum number of concurrent API requests
 
     Returns:
         List of 1-line summaries corresponding to each input function
     """
     logger.info("Summarizing %d functions", len(functions))
-    summaries = []
+    if not functions:
+        return []
+
+    def one(func: dict) -> str:
+        return summarize_function(func.get("code", ""), function_name=func.get("name"))
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(functions))),
+        thread_name_prefix="wmcp-summarize",
+    ) as pool:
+        return list(pool.map(one, functions))
+
+
+async def summarize_batch_async(
+    functions: list[dict],
+    concurrency: int = SUMMARIZE_CONCURRENCY
+) -> list[str]:
+    """
+    Summarize multiple functions concurrently on the event loop.
 
-    for func in functions:
-        code = func.get("code", "")
-        name = func.get("name")
+    Args:
+        functions: List of dictionaries with "code" and optional "name" keys
+        concurrency: Maximum number of concurrent API requests
+
+    Returns:
+        List of 1-line summaries corresponding to each input function
+    """
+    logger.info("Summarizing %d functions", len(functions))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-        summary = summarize_function(code, function_name=name)
-        summaries.append(summary)
+    async def one(func: dict) -> str:
+        async with semaphore:
+            return await summarize_function_async(
+                func.get("code", ""), function_name=func.get("name")
+            )
 
-    return summaries
+    return list(await asyncio.gather(*(one(func) for func in functions)))
 
 
 if __name__ == "__main__":
@@ -5,12 +5,24 @@ Formats search results in a compact, token-efficient tabular format.
 """
 
 import json
+import re
+from functools import lru_cache
+from typing import Callable, Iterator
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from .config import get_config
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Non-ASCII characters, which json.dumps escapes and orjson writes raw
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
 
 def truncate(value: str, max_length: int) -> str:
     """Truncate a string to max_length, adding '...' if truncated."""
@@ -35,10 +47,81 @@ def format_results_toon(results: list[dict]) -> str:
     if not results:
         return "results\n  (empty)"
 
-    config = get_config()
-    toon_config = config.toon_formatter
+    toon_config = get_config().toon_formatter
+    columns = _toon_columns(toon_config)
+
+    # Process data rows, tracking column widths (max of header and all
+    # data) in the same pass
+    col_widths = [len(header) for _, header, _, _ in columns]
+    cell_specs = [(i, key, max_width, formatter) for i, (key, _, max_width, formatter) in enumerate(columns)]
+    rows = []
+    for result in results:
+        row = []
+        for i, key, max_width, formatter in cell_specs:
+            value = result.get(key, "")
+            formatted = formatter(value) if value != "" else ""
+            # truncate() inlined: most cells fit and skip the call entirely
+            if len(formatted) > max_width:
+                formatted = formatted[:max_width - 3] + "..."
+            if len(formatted) > col_widths[i]:
+                col_widths[i] = len(formatted)
+            row.append(formatted)
+        rows.append(row)
+
+    return _render_toon(toon_config, columns, col_widths, rows)
+
+
+def format_results_toon_soa(columns_data: dict[str, list]) -> str:
+    """
+    Format column-oriented search results in TOON format.
+
+    Same output as format_results_toon(), but takes one list per field
+    instead of one dict per result, e.g.
+    {"function_name": [...], "file_path": [...], "similarity": [...]},
+    so cells are read by list index rather than a dict lookup each.
+
+    Args:
+        columns_data: Mapping of result key to equal-length value lists;
+            configured columns missing from it render as empty cells
+
+    Returns:
+        TOON-formatted string
 
-    # Build column specs from config: (key, header, max_width)
+    Raises:
+        ValueError: If the value lists differ in length
+    """
+    lengths = {len(values) for values in columns_data.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+    n_rows = lengths.pop() if lengths else 0
+    if not n_rows:
+        return "results\n  (empty)"
+
+    toon_config = get_config().toon_formatter
+    columns = _toon_columns(toon_config)
+
+    # Format one column at a time; its width falls out of the same pass
+    col_widths = []
+    cell_columns = []
+    for key, header, max_width, formatter in columns:
+        values = columns_data.get(key)
+        if values is None:
+            cells = [""] * n_rows
+        else:
+            cells = []
+            for value in values:
+                formatted = formatter(value) if value != "" else ""
+                if len(formatted) > max_width:
+                    formatted = formatted[:max_width - 3] + "..."
+                cells.append(formatted)
+        col_widths.append(max(len(header), max(map(len, cells), default=0)))
+        cell_columns.append(cells)
+
+    return _render_toon(toon_config, columns, col_widths, zip(*cell_columns))
+
+
+def _toon_columns(toon_config) -> list[tuple]:
+    """Column specs from config: (key, header, max_width, formatter)."""
     # Add formatter based on key
     formatters = {
         "similarity": lambda x: f"{int(x * 100)}%",
@@ -48,40 +131,42 @@ def format_results_toon(results: list[dict]) -> str:
     for key, header, max_width in toon_config.columns:
         formatter = formatters.get(key, str)
         columns.append((key, header, max_width, formatter))
+    return columns
 
-    # Process data rows
-    rows = []
-    for result in results:
-        row = []
-        for key, _, max_width, formatter in columns:
-            value = result.get(key, "")
-            formatted = formatter(value) if value != "" else ""
-            truncated = truncate(formatted, max_width)
-            row.append(truncated)
-        rows.append(row)
-
-    # Calculate column widths (max of header and all data)
-    col_widths = []
-    for i, (_, header, max_width, _) in enumerate(columns):
-        data_max = max((len(rows[j][i]) for j in range(len(rows))), default=0)
-        col_widths.append(max(len(header), data_max))
 
-    # Build output using config separators
+def _render_toon(toon_config, columns: list[tuple], col_widths: list[int], rows) -> str:
+    """Lay out formatted rows under the header using config separators."""
     row_indent = toon_config.row_indent
     col_sep = toon_config.column_separator
 
-    lines = ["results"]
+    # One compiled row formatter per layout replaces per-cell ljust
+    format_row = _row_formatter(row_indent, col_sep, tuple(col_widths))
+
+    # Header row, then data rows joined straight from a generator
+    header_line = format_row([header for _, header, _, _ in columns])
+    return f"results\n{header_line}\n" + "\n".join(map(format_row, rows))
 
-    # Header row
-    headers = [columns[i][1].ljust(col_widths[i]) for i in range(len(columns))]
-    lines.append(row_indent + col_sep.join(headers))
 
-    # Data rows
-    for row in rows:
-        cells = [row[i].ljust(col_widths[i]) for i in range(len(columns))]
-        lines.append(row_indent + col_sep.join(cells))
+def _escape_braces(text: str) -> str:
+    """Escape literal braces for use in a format template."""
+    return text.replace("{", "{{").replace("}", "}}")
 
-    return "\n".join(lines)
+
+@lru_cache(maxsize=256)
+def _row_formatter(row_indent: str, col_sep: str, col_widths: tuple) -> Callable[[list], str]:
+    """
+    Compile a function that pads one row of cells to col_widths.
+
+    The row is rendered by a single generated f-string (e.g.
+    f"  {r[0]:<20} | {r[1]:<6}"), which avoids str.format's argument
+    packing. Layouts repeat across searches, so formatters are memoized.
+    """
+    template = _escape_braces(row_indent) + _escape_braces(col_sep).join(
+        f"{{r[{i}]:<{width}}}" for i, width in enumerate(col_widths)
+    )
+    namespace: dict = {}
+    exec(f"def format_row(r): return f{template!r}", namespace)
+    return namespace["format_row"]
 
 
 def format_results_json(results: list[dict]) -> str:
@@ -96,92 +181,145 @@ def format_results_json(results: list[dict]) -> str:
         - similarity: float
 
     Output: JSON-formatted string
+
+    Uses orjson when installed (pip install washedmcp[fast]). The output is
+    the same as json.dumps(indent=2) either way, including \\uXXXX escapes
+    for non-ASCII text, so the token-savings baseline does not depend on
+    which backend is installed.
     """
+    if HAS_ORJSON:
+        return format_results_json_bytes(results).decode("ascii")
     return json.dumps(results, indent=2)
 
 
-def format_results_rich(results: list[dict], context: dict = None) -> str:
+def format_results_json_bytes(results: list[dict]) -> bytes:
     """
-    Format search results with rich context (calls, callers, same file).
+    Format search results as ASCII-encoded JSON.
+
+    Same output as format_results_json(), for callers that write to a
+    socket or file: with orjson installed, all-ASCII output is returned as
+    produced, skipping the decode/encode round trip through str.
+    """
+    if HAS_ORJSON:
+        data = orjson.dumps(
+            results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
+        if data.isascii():
+            return data
+        # orjson writes non-ASCII text raw (it can only occur inside
+        # strings); escape it the way json.dumps does
+        return _NON_ASCII_RE.sub(_escape_non_ascii, data.decode("utf-8")).encode("ascii")
+    return json.dumps(results, indent=2).encode("ascii")
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    """json.dumps-style \\uXXXX escape, as a surrogate pair above the BMP."""
+    code = ord(match.group())
+    if code <= 0xFFFF:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _match_label(result: dict, short: bool = False) -> str:
+    """Describe how a result matched: its similarity, or an exact name hit."""
+    if "similarity" not in result and result.get("exact_match"):
+        return "exact" if short else "exact name match"
+    similarity_pct = int(result.get("similarity", 0.0) * 100)
+    return f"{similarity_pct}%" if short else f"{similarity_pct}% match"
+
+
+def format_results_rich_iter(results: list[dict], context: dict = None) -> Iterator[str]:
+    """
+    Yield the lines of the rich format one at a time.
+
+    Lets callers write a large response (high top_k, deep context) to a
+    buffer or stream without first building a list of every line.
 
     Args:
         results: List of search result dicts
-        context: Optional context dict from get_function_context() with keys:
-            - function: The main function dict
-            - callees: Functions this one calls
-            - callers: Functions that call this one
-            - same_file: Other functions in the same file
+        context: Optional context dict from get_function_context()
 
-    Returns:
-        Rich formatted string for display
+    Yields:
+        Output lines, without trailing newlines
     """
     if not results:
-        return "No results found."
+        yield "No results found."
+        return
 
     config = get_config()
     toon_config = config.toon_formatter
 
-    lines = []
     best = results[0]
 
     # Format the best match header
     func_name = best.get("function_name", "unknown")
     file_path = best.get("file_path", "unknown")
     line_start = best.get("line_start", 0)
-    similarity = best.get("similarity", 0.0)
-    similarity_pct = int(similarity * 100)
 
-    lines.append(f"FOUND: {func_name}() in {file_path}:{line_start} ({similarity_pct}% match)")
-    lines.append("")
+    yield f"FOUND: {func_name}() in {file_path}:{line_start} ({_match_label(best)})"
+    yield ""
 
     # Show the code if available
     code = best.get("code", best.get("body", ""))
     if code:
-        lines.append("CODE:")
+        yield "CODE:"
         code_lines = code.strip().split("\n")
         max_code_lines = toon_config.max_code_lines
         # Truncate if too long
-        if len(code_lines) > max_code_lines:
-            code_lines = code_lines[:max_code_lines]
-            code_lines.append(f"  {toon_config.truncation_indicator} (truncated)")
-        for code_line in code_lines:
-            lines.append(f"  {code_line}")
-        lines.append("")
+        truncated = len(code_lines) > max_code_lines
+        for code_line in code_lines[:max_code_lines]:
+            yield f"  {code_line}"
+        if truncated:
+            yield f"    {toon_config.truncation_indicator} (truncated)"
+        yield ""
 
     # Show context relationships if provided
     if context:
         # CALLS: functions this one calls
         callees = context.get("callees", [])
         if callees:
-            callee_names = [f.get("function_name", "unknown") for f in callees]
-            lines.append(f"CALLS: {', '.join(callee_names)}")
+            yield f"CALLS: {', '.join(f.get('function_name', 'unknown') for f in callees)}"
 
         # CALLED BY: functions that call this one
         callers = context.get("callers", [])
         if callers:
-            caller_names = [f.get("function_name", "unknown") for f in callers]
-            lines.append(f"CALLED BY: {', '.join(caller_names)}")
+            yield f"CALLED BY: {', '.join(f.get('function_name', 'unknown') for f in callers)}"
 
         # SAME FILE: other functions in the same file
         same_file = context.get("same_file", [])
         if same_file:
-            same_file_names = [f.get("function_name", "unknown") for f in same_file]
-            lines.append(f"SAME FILE: {', '.join(same_file_names)}")
+            yield f"SAME FILE: {', '.join(f.get('function_name', 'unknown') for f in same_file)}"
 
         if callees or callers or same_file:
-            lines.append("")
+            yield ""
 
     # Show additional matches if there are more results
     if len(results) > 1:
-        lines.append("---")
-        lines.append("Additional matches:")
+        yield "---"
+        yield "Additional matches:"
         for result in results[1:]:
             r_file = result.get("file_path", "unknown")
             r_line = result.get("line_start", 0)
-            r_sim = int(result.get("similarity", 0.0) * 100)
-            lines.append(f"  {r_file}:{r_line} ({r_sim}%)")
+            yield f"  {r_file}:{r_line} ({_match_label(result, short=True)})"
+
 
-    return "\n".join(lines)
+def format_results_rich(results: list[dict], context: dict = None) -> str:
+    """
+    Format search results with rich context (calls, callers, same file).
+
+    Args:
+        results: List of search result dicts
+        context: Optional context dict from get_function_context() with keys:
+            - function: The main function dict
+            - callees: Functions this one calls
+            - callers: Functions that call this one
+            - same_file: Other functions in the same file
+
+    Returns:
+        Rich formatted string for display
+    """
+    return "\n".join(format_results_rich_iter(results, context))
 
 
 def format_results(results: list[dict], format: str = "toon", context: dict = None, track_stats: bool = True) -> str: